@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+        Plan limits, quota status, job submission cooldowns, idempotency keys and the applied jobs index
+        are kept in the cache, every worker and management command has to see the same entries.
+    """
+    if settings.DEBUG or not settings.CACHES['default']['BACKEND'].endswith('.LocMemCache'):
+        return []
+
+    return [Warning(
+        'The default cache is local to the process, so it is not shared by the workers and management commands.',
+        hint='Set REDIS_URL to a Redis server (see docker-compose.yml).',
+        id='core.W001',
+    )]
@@ -1,8 +1,14 @@
 import functools
+import hashlib
 import json
 import logging
 
-from apps.core.exceptions import BaseValidationError
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from apps.core.exceptions import BaseValidationError, IdempotentRequestInProgressException, \
+    IdempotencyKeyReusedException
 
 
 def validate_request_params(serializer_class):
@@ -42,3 +48,59 @@ def request_logger(logger):
             return view_func(self, request, *args, **kwargs)
         return wrapped
     return wrapper
+
+
+def idempotent(view_func):
+    """
+        Makes a write view safe to retry with an "Idempotency-Key" header.
+        The first request with a key runs the view and its successful response is stored
+        for IDEMPOTENCY_KEY_TIMEOUT seconds, repeated requests with the same key and
+        payload get the stored response replayed without running the view again.
+        A repeat while the first request is running (for at most IDEMPOTENCY_LOCK_TIMEOUT seconds)
+        gets 409, a key reused with a different payload gets 422.
+        Failed responses and errors are not stored, so they can be retried.
+    """
+    @functools.wraps(view_func)
+    def wrapped(self, request, *args, **kwargs):
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if not idempotency_key:
+            return view_func(self, request, *args, **kwargs)
+
+        if len(idempotency_key) > 255:
+            raise BaseValidationError("Idempotency-Key must be at most 255 characters")
+
+        action = f"{view_func.__module__}.{view_func.__qualname__}"
+        cache_key = 'idempotency_' + hashlib.sha256(
+            f"{request.user.id}:{action}:{idempotency_key}".encode()
+        ).hexdigest()
+        fingerprint = hashlib.sha256(json.dumps(
+            {"path": request.path, "kwargs": kwargs, "data": request.data}, sort_keys=True, default=str
+        ).encode()).hexdigest()
+
+        # the in progress marker expires soon, so a key of a request whose worker died can be retried
+        if not cache.add(cache_key, {"fingerprint": fingerprint}, timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT):
+            stored = cache.get(cache_key) or {}
+            if stored.get('fingerprint') != fingerprint:
+                raise IdempotencyKeyReusedException()
+            if 'status' not in stored:
+                raise IdempotentRequestInProgressException()
+
+            return Response(stored['data'], status=stored['status'], headers={'Idempotent-Replayed': 'true'})
+
+        try:
+            response = view_func(self, request, *args, **kwargs)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        if 200 <= response.status_code < 300:
+            cache.set(cache_key, {
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "data": response.data,
+            }, timeout=settings.IDEMPOTENCY_KEY_TIMEOUT)
+        else:
+            cache.delete(cache_key)
+
+        return response
+    return wrapped
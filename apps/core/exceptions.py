@@ -38,3 +38,15 @@ class BaseAPIException(APIException):
 
 class LogicException(BaseAPIException):
     ...
+
+
+class IdempotentRequestInProgressException(BaseAPIException):
+    default_detail = 'A request with this Idempotency-Key is still in progress.'
+    default_code = 'idempotent_request_in_progress'
+    status_code = 409
+
+
+class IdempotencyKeyReusedException(BaseAPIException):
+    default_detail = 'This Idempotency-Key was already used with a different request.'
+    default_code = 'idempotency_key_reused'
+    status_code = 422
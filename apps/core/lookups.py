@@ -0,0 +1,31 @@
+import re
+
+from django.conf import settings
+from django.db.models import Lookup
+from django.db.models.lookups import IContains
+
+
+class FullTextSearch(Lookup):
+    """
+        field__search=<text> matches the rows where every word of the text starts a word of the field.
+        On MySQL with FULLTEXT_SEARCH_ENABLED it's a MATCH ... AGAINST boolean mode query served by
+        a FULLTEXT index on exactly this field (see AddFullTextIndex), so it's registered on the indexed fields only.
+        Elsewhere, and for words shorter than the indexed tokens, it falls back to icontains.
+    """
+    lookup_name = 'search'
+
+    def as_mysql(self, compiler, connection):
+        if not settings.FULLTEXT_SEARCH_ENABLED:
+            return self.as_sql(compiler, connection)
+
+        words = re.findall(r'\w+', self.rhs) if isinstance(self.rhs, str) else []
+        if not words or min(len(word) for word in words) < settings.FULLTEXT_MIN_TOKEN_SIZE:
+            return self.as_sql(compiler, connection)
+
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        query = ' '.join(f'+{word}*' for word in words)
+
+        return f'MATCH ({lhs}) AGAINST (%s IN BOOLEAN MODE)', [*lhs_params, query]
+
+    def as_sql(self, compiler, connection):
+        return compiler.compile(IContains(self.lhs, self.rhs))
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+
+class AddIndexOnline(migrations.AddIndex):
+    """
+        AddIndex which doesn't block writes to the table while the index is built on MySQL
+        (InnoDB online DDL), other databases create the index as usual.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if schema_editor.connection.vendor != 'mysql' or not self.allow_migrate_model(
+                schema_editor.connection.alias, model
+        ):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+        schema_editor.execute(f'{self.index.create_sql(model, schema_editor)} ALGORITHM=INPLACE LOCK=NONE')
+
+    def describe(self):
+        return f'{super().describe()} online'
+
+
+class AddFullTextIndex(migrations.operations.base.Operation):
+    """
+        MySQL FULLTEXT index on the given fields, used by the search lookup (apps.core.lookups).
+        It's not a part of the models state, other databases get no index and the lookup falls back to icontains.
+    """
+    reversible = True
+
+    def __init__(self, model_name, fields, name):
+        self.model_name = model_name
+        self.fields = fields
+        self.name = name
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [], {'model_name': self.model_name, 'fields': self.fields, 'name': self.name}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _should_run(self, app_label, schema_editor, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        return schema_editor.connection.vendor == 'mysql' and self.allow_migrate_model(
+            schema_editor.connection.alias, model
+        ), model
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        should_run, model = self._should_run(app_label, schema_editor, to_state)
+        if not should_run:
+            return
+
+        columns = ', '.join(schema_editor.quote_name(model._meta.get_field(field).column) for field in self.fields)
+        schema_editor.execute(
+            f'CREATE FULLTEXT INDEX {schema_editor.quote_name(self.name)} '
+            f'ON {schema_editor.quote_name(model._meta.db_table)} ({columns})'
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        should_run, model = self._should_run(app_label, schema_editor, from_state)
+        if not should_run:
+            return
+
+        schema_editor.execute(
+            f'DROP INDEX {schema_editor.quote_name(self.name)} ON {schema_editor.quote_name(model._meta.db_table)}'
+        )
+
+    def describe(self):
+        return f'Create FULLTEXT index {self.name} on {", ".join(self.fields)} of model {self.model_name}'
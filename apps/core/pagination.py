@@ -1,5 +1,142 @@
+import base64
+from collections import OrderedDict
+from urllib import parse
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
 
 
 class DynamicPageSizePagination(pagination.PageNumberPagination):
+    page_size = settings.DEFAULT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+        Cursor pagination on (created_at, id), newest first.
+        A page is read by seeking the position in the (..., created_at) index instead of
+        skipping the previous rows with OFFSET, so deep pages are as fast as the first one,
+        and rows created meanwhile don't shift the pages.
+        The total count is optional (?with_count=true) and capped at APPROXIMATE_COUNT_LIMIT,
+        count_exact tells whether it's the real total.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = settings.DEFAULT_PAGE_SIZE
+    max_page_size = settings.MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
     page_size_query_param = 'page_size'
+    count_query_param = 'with_count'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) == 'true':
+            self.count = queryset.order_by()[:settings.APPROXIMATE_COUNT_LIMIT + 1].count()
+
+        if position is None:
+            queryset = queryset.order_by(*self.ordering)
+        elif reverse:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            ).order_by('created_at', 'id')
+        else:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            ).order_by(*self.ordering)
+
+        # one extra row tells whether there is a page further in the reading direction
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        self.page = results[:page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            tokens = parse.parse_qs(base64.b64decode(encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+            created_at = parse_datetime(tokens['c'][0])
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return (created_at, pk), reverse
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        tokens = {'c': instance.created_at.isoformat(), 'i': instance.pk}
+        if reverse:
+            tokens['r'] = 1
+        encoded = base64.b64encode(parse.urlencode(tokens, doseq=True).encode('ascii')).decode('ascii')
+
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.count is not None:
+            response['count'] = min(self.count, settings.APPROXIMATE_COUNT_LIMIT)
+            response['count_exact'] = self.count <= settings.APPROXIMATE_COUNT_LIMIT
+        response['results'] = data
+
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'count_exact': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
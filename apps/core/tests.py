@@ -1,3 +1,66 @@
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
 
-# Create your tests here.
+from apps.core.checks import check_shared_cache
+from apps.job_applying.models import AppliedJob
+
+try:
+    from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+except ImproperlyConfigured:
+    # mysqlclient isn't installed
+    MySQLDatabaseWrapper = None
+
+
+class FullTextSearchLookupTestCase(SimpleTestCase):
+    """
+        The search lookup compiled for MySQL, no server is needed.
+    """
+
+    def setUp(self):
+        if MySQLDatabaseWrapper is None:
+            self.skipTest('mysqlclient is not installed')
+
+        self.connection = MySQLDatabaseWrapper({
+            'ENGINE': 'django.db.backends.mysql', 'NAME': 'autosubmit', 'USER': '', 'PASSWORD': '', 'HOST': '',
+            'PORT': '', 'OPTIONS': {}, 'TIME_ZONE': None, 'AUTOCOMMIT': True, 'ATOMIC_REQUESTS': False,
+            'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'TEST': {},
+        }, alias='mysql')
+
+    def compile(self, **lookups):
+        queryset = AppliedJob.objects.filter(user_id=1, **lookups).values('id')
+        return queryset.query.get_compiler(connection=self.connection).as_sql()
+
+    @override_settings(FULLTEXT_SEARCH_ENABLED=True)
+    def test_match_against(self):
+        sql, params = self.compile(title__search='python Developer')
+        self.assertIn('MATCH (`applied_jobs`.`title`) AGAINST (%s IN BOOLEAN MODE)', sql)
+        self.assertEqual(params, ('+python* +Developer*', 1))
+
+    @override_settings(FULLTEXT_SEARCH_ENABLED=True, FULLTEXT_MIN_TOKEN_SIZE=3)
+    def test_short_word_falls_back_to_like(self):
+        sql, params = self.compile(company__search='ab corp')
+        self.assertNotIn('MATCH', sql)
+        self.assertIn('`applied_jobs`.`company` LIKE %s', sql)
+        self.assertEqual(params, ('%ab corp%', 1))
+
+    def test_disabled_by_default(self):
+        sql, params = self.compile(title__search='python')
+        self.assertNotIn('MATCH', sql)
+        self.assertIn('`applied_jobs`.`title` LIKE %s', sql)
+
+
+class SharedCacheCheckTestCase(SimpleTestCase):
+    locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://redis:6379'}}
+
+    @override_settings(DEBUG=False, CACHES=locmem)
+    def test_process_local_cache(self):
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ['core.W001'])
+
+    @override_settings(DEBUG=False, CACHES=redis)
+    def test_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(DEBUG=True, CACHES=locmem)
+    def test_process_local_cache_while_debugging(self):
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,32 @@
+from django.core.files.uploadhandler import FileUploadHandler
+
+from apps.core.exceptions import BaseValidationError
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """
+        Validates the size of uploaded files while they are streamed, the request is rejected
+        as soon as a file grows over ``max_size`` KB instead of after it has been fully received.
+        It only checks the chunks, so it should be followed by a handler which stores them
+        (ex. TemporaryFileUploadHandler).
+    """
+    def __init__(self, request=None, max_size: int = None):
+        super().__init__(request)
+        self.max_size = max_size
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # the whole body may only exceed the limit by the multipart overhead of the other fields
+        if self.max_size and content_length and content_length > self.max_size * 1000 + self.chunk_size:
+            self.raise_size_error()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.max_size and start + len(raw_data) > self.max_size * 1000:
+            self.raise_size_error()
+
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+    def raise_size_error(self):
+        raise BaseValidationError(f'The file must be no larger than {self.max_size} KB')
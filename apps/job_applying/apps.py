@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AutoSubmitConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.job_applying'
+
+    def ready(self):
+        import apps.job_applying.signals
+        from apps.core.lookups import FullTextSearch
+
+        # the fields with a FULLTEXT index (migration 0010)
+        for model in (self.get_model('AppliedJob'), self.get_model('ArchivedAppliedJob')):
+            for field_name in ('title', 'company'):
+                model._meta.get_field(field_name).register_lookup(FullTextSearch)
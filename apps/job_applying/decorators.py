@@ -4,12 +4,13 @@ from rest_framework.exceptions import PermissionDenied
 
 from apps.job_applying.exceptions import RequiresActiveSubscriptionException
 from apps.job_applying.utils import validate_plan_limits
+from apps.payment.snapshots import get_subscription_snapshot
 
 
 def active_plan_requires(view_func):
     @functools.wraps(view_func)
     def wrapped(self, request, *args, **kwargs):
-        if not request.user.active_subscription:
+        if not get_subscription_snapshot(request.user):
             raise RequiresActiveSubscriptionException()
         return view_func(self, request, *args, **kwargs)
     return wrapped
@@ -8,6 +8,15 @@ class JobStatuses(models.TextChoices):
     CANCELED = 'canceled', 'Canceled'
 
 
+# statuses a job may move to from its current status, jobs leave CREATED only once
+JOB_STATUS_TRANSITIONS = {
+    JobStatuses.CREATED: (JobStatuses.APPLIED, JobStatuses.FAILED, JobStatuses.CANCELED),
+    JobStatuses.APPLIED: (),
+    JobStatuses.FAILED: (),
+    JobStatuses.CANCELED: (),
+}
+
+
 class JobSearchPlatforms(models.TextChoices):
     LINKEDIN = 'linkedin', 'LinkedIn'
 
@@ -20,6 +20,15 @@ class JobSubmissionsDelayException(BaseAPIException):
     default_code = 'job_submissions_delay_error'
     status_code = 429
 
+    def __init__(self, wait: int = None, detail=None, code=None):
+        # seconds until the next submission is allowed, sent in the Retry-After header
+        self.wait = wait
+        if wait is not None and detail is None:
+            detail = {'detail': self.default_detail}
+        super().__init__(detail, code)
+        if wait is not None and isinstance(self.detail, dict):
+            self.detail['retry_after'] = wait
+
 
 class DuplicateApplyException(BaseAPIException):
     default_detail = f'This job has already been tried for apply.'
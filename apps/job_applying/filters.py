@@ -7,8 +7,8 @@ class AppliedJobFilter(filters.FilterSet):
     class Meta:
         model = AppliedJob
         fields = {
-            'title': ['icontains'],
+            'title': ['icontains', 'search'],
             'created_at': ['lte', 'gte'],
             'status': ['exact'],
-            'company': ['icontains'],
+            'company': ['icontains', 'search'],
         }
@@ -0,0 +1,30 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.job_applying.services.archive import archive_applied_jobs_batch
+
+
+class Command(BaseCommand):
+    help = "Move finished jobs older than APPLIED_JOBS_ARCHIVE_AFTER_DAYS and their answers to the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=settings.APPLIED_JOBS_ARCHIVE_AFTER_DAYS)
+
+    def handle(self, *args, **options):
+        created_before = timezone.now() - datetime.timedelta(days=options['days'])
+
+        archived_jobs, archived_answers = 0, 0
+        while True:
+            jobs, answers = archive_applied_jobs_batch(created_before, options['batch_size'])
+            if not jobs:
+                break
+
+            archived_jobs += jobs
+            archived_answers += answers
+            self.stdout.write(f'Archived jobs: {archived_jobs}, answers: {archived_answers}')
+
+        self.stdout.write(f'Done. Archived jobs: {archived_jobs}, answers: {archived_answers}')
@@ -0,0 +1,39 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.job_applying.enums import JobStatuses
+from apps.job_applying.models import AppliedJob
+
+
+class Command(BaseCommand):
+    help = "Cancel jobs which stayed in created status longer than STALE_CREATED_JOB_TTL, " \
+           "should be scheduled (ex. cron) to run regularly"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--ttl', type=int, default=settings.STALE_CREATED_JOB_TTL, help='In seconds')
+
+    def handle(self, *args, **options):
+        created_before = timezone.now() - datetime.timedelta(seconds=options['ttl'])
+        stale_jobs = AppliedJob.objects.filter(status=JobStatuses.CREATED, created_at__lt=created_before)
+
+        canceled, last_id = 0, 0
+        while True:
+            ids = list(
+                stale_jobs.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+
+            # every batch is committed on its own, so locks are held briefly
+            with transaction.atomic():
+                canceled += AppliedJob.objects.filter(id__in=ids, status=JobStatuses.CREATED).update(
+                    status=JobStatuses.CANCELED, updated_at=timezone.now()
+                )
+            last_id = ids[-1]
+
+        self.stdout.write(f'Canceled stale jobs: {canceled}')
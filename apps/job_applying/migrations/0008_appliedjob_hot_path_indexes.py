@@ -0,0 +1,23 @@
+# Generated by Django 4.2.2 on 2026-10-19 12:01
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexOnline
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_applying', '0007_alter_appliedjobqa_answer_and_more'),
+    ]
+
+    operations = [
+        AddIndexOnline(
+            model_name='appliedjob',
+            index=models.Index(fields=['user', 'created_at'], name='applied_jobs_user_created_idx'),
+        ),
+        AddIndexOnline(
+            model_name='appliedjob',
+            index=models.Index(fields=['used_subscription', 'status', 'created_at'], name='applied_jobs_subscription_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.2 on 2026-10-19 12:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0008_subscription_user_active_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('job_applying', '0008_appliedjob_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAppliedJob',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=125)),
+                ('job_url', models.URLField(max_length=800)),
+                ('job_id', models.CharField(max_length=40)),
+                ('platform', models.CharField(choices=[('linkedin', 'LinkedIn')], default='linkedin', max_length=25)),
+                ('status', models.CharField(choices=[('created', 'Created'), ('applied', 'Applied'), ('failed', 'Failed'), ('canceled', 'Canceled')], max_length=25)),
+                ('company', models.CharField(max_length=125, null=True)),
+                ('powered_by', models.CharField(blank=True, max_length=50, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(verbose_name='Last Update')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('used_subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applied_jobs', to='payment.subscription')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applied_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'archived_applied_jobs',
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAppliedJobQA',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('question', models.TextField(blank=True, null=True)),
+                ('answer', models.TextField(blank=True, null=True)),
+                ('answer_options', models.JSONField(blank=True, null=True)),
+                ('prefilled_answer', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(verbose_name='Last Update')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='job_applying.archivedappliedjob')),
+            ],
+            options={
+                'db_table': 'archived_applied_job_question_answers',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedappliedjob',
+            index=models.Index(fields=['user', 'job_id', 'platform'], name='archived_jobs_user_job_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedappliedjob',
+            index=models.Index(fields=['user', 'created_at'], name='archived_jobs_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.2 on 2026-10-19 15:20
+
+from django.db import migrations
+
+from apps.core.operations import AddFullTextIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_applying', '0009_archivedappliedjob_archivedappliedjobqa'),
+    ]
+
+    operations = [
+        AddFullTextIndex(model_name='appliedjob', fields=['title'], name='applied_jobs_title_ft'),
+        AddFullTextIndex(model_name='appliedjob', fields=['company'], name='applied_jobs_company_ft'),
+        AddFullTextIndex(model_name='archivedappliedjob', fields=['title'], name='archived_jobs_title_ft'),
+        AddFullTextIndex(model_name='archivedappliedjob', fields=['company'], name='archived_jobs_company_ft'),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
 # Create your models here.
 from apps.core.models import TimestampsModel
@@ -18,10 +19,28 @@ class AppliedJob(TimestampsModel):
     company = models.CharField(max_length=125, null=True)
     powered_by = models.CharField(max_length=50, null=True, blank=True)
 
+    # status the row had when it was loaded, used to track status transitions
+    loaded_status = None
+
     class Meta:
         db_table = 'applied_jobs'
         unique_together = ('job_id', 'user', 'platform')
         ordering = ('-created_at', )
+        # duplicate and pending job checks are served by the unique_together index
+        indexes = [
+            # submission delay check and the jobs list ordered by -created_at
+            models.Index(fields=['user', 'created_at'], name='applied_jobs_user_created_idx'),
+            # quota reservation and usage recount
+            models.Index(
+                fields=['used_subscription', 'status', 'created_at'], name='applied_jobs_subscription_idx'
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_status = instance.__dict__.get('status')
+        return instance
 
 
 class AppliedJobQA(TimestampsModel):
@@ -33,3 +52,46 @@ class AppliedJobQA(TimestampsModel):
 
     class Meta:
         db_table = 'applied_job_question_answers'
+
+
+class ArchivedAppliedJob(models.Model):
+    """
+        Applied jobs moved out of applied_jobs by the archive_applied_jobs command, ids are kept.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_applied_jobs')
+    title = models.CharField(max_length=125)
+    job_url = models.URLField(max_length=800)
+    used_subscription = models.ForeignKey(
+        Subscription, on_delete=models.CASCADE, related_name='archived_applied_jobs'
+    )
+    job_id = models.CharField(max_length=40)
+    platform = models.CharField(choices=JobSearchPlatforms.choices, max_length=25, default=JobSearchPlatforms.LINKEDIN)
+    status = models.CharField(choices=JobStatuses.choices, max_length=25)
+    company = models.CharField(max_length=125, null=True)
+    powered_by = models.CharField(max_length=50, null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField(_('Last Update'))
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'archived_applied_jobs'
+        ordering = ('-created_at', )
+        indexes = [
+            models.Index(fields=['user', 'job_id', 'platform'], name='archived_jobs_user_job_idx'),
+            models.Index(fields=['user', 'created_at'], name='archived_jobs_user_created_idx'),
+        ]
+
+
+class ArchivedAppliedJobQA(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedAppliedJob, on_delete=models.CASCADE, related_name='answers')
+    question = models.TextField(null=True, blank=True)
+    answer = models.TextField(null=True, blank=True)
+    answer_options = models.JSONField(null=True, blank=True)
+    prefilled_answer = models.CharField(max_length=100, null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField(_('Last Update'))
+
+    class Meta:
+        db_table = 'archived_applied_job_question_answers'
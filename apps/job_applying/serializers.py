@@ -1,5 +1,7 @@
+from django.conf import settings
 from rest_framework import serializers
-from apps.job_applying.models import AppliedJob, AppliedJobQA
+from apps.job_applying.enums import JobStatuses
+from apps.job_applying.models import AppliedJob, AppliedJobQA, ArchivedAppliedJob, ArchivedAppliedJobQA
 
 
 class AppliedJobQASerializer(serializers.ModelSerializer):
@@ -15,3 +17,59 @@ class AppliedJobSerializer(serializers.ModelSerializer):
     class Meta:
         model = AppliedJob
         fields = '__all__'
+
+
+class AppliedJobListSerializer(serializers.ModelSerializer):
+    answers_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = AppliedJob
+        fields = '__all__'
+
+
+class ArchivedAppliedJobQASerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = ArchivedAppliedJobQA
+        fields = '__all__'
+
+
+class ArchivedAppliedJobSerializer(serializers.ModelSerializer):
+    answers = serializers.ListSerializer(child=ArchivedAppliedJobQASerializer(), read_only=True)
+    archived = serializers.BooleanField(default=True, read_only=True)
+
+    class Meta:
+        model = ArchivedAppliedJob
+        exclude = ('archived_at', )
+
+
+class ArchivedAppliedJobListSerializer(serializers.ModelSerializer):
+    answers_count = serializers.IntegerField(read_only=True)
+    archived = serializers.BooleanField(default=True, read_only=True)
+
+    class Meta:
+        model = ArchivedAppliedJob
+        exclude = ('archived_at', )
+
+
+class JobEligibilitySerializer(serializers.Serializer):
+    job_id = serializers.CharField(max_length=40)
+    company = serializers.CharField(max_length=125, required=False, allow_null=True, allow_blank=True)
+    powered_by = serializers.CharField(max_length=50, required=False, allow_null=True, allow_blank=True)
+
+
+class BulkJobEligibilitySerializer(serializers.Serializer):
+    jobs = serializers.ListField(
+        child=JobEligibilitySerializer(), allow_empty=False, max_length=settings.BULK_ELIGIBILITY_MAX_JOBS
+    )
+
+
+class JobStatusTransitionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=JobStatuses.choices)
+
+
+class BulkJobStatusUpdateSerializer(serializers.Serializer):
+    jobs = serializers.ListField(
+        child=JobStatusTransitionSerializer(), allow_empty=False, max_length=settings.BULK_STATUS_UPDATE_MAX_JOBS
+    )
@@ -0,0 +1,165 @@
+import hashlib
+import math
+import uuid
+from typing import Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.job_applying.models import AppliedJob, ArchivedAppliedJob
+
+
+class BloomFilter:
+    """
+        Compact set of strings answering "definitely not a member" or "maybe a member",
+        sized for the given capacity and false positive rate.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.capacity = capacity
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big')
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position // 8] |= 1 << (position % 8)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+def _index_key(user_id: int, platform: str) -> str:
+    return f'applied_jobs_index_{user_id}_{platform}'
+
+
+def _version_key(user_id: int, platform: str) -> str:
+    return f'applied_jobs_index_version_{user_id}_{platform}'
+
+
+def _count_key(version: str) -> str:
+    return f'applied_jobs_index_count_{version}'
+
+
+def _added_job_key(version: str, number: int) -> str:
+    return f'applied_jobs_index_added_{version}_{number}'
+
+
+def _get_version(user_id: int, platform: str, version: Optional[str]) -> Tuple[Optional[str], Optional[int]]:
+    """
+        Returns the user's index version and the number of jobs created since it started.
+        A version whose counter was lost (evicted) is replaced, as the jobs added to it can't be listed anymore.
+    """
+    if version is not None:
+        count = cache.get(_count_key(version))
+        if count is not None:
+            return version, count
+
+    version_key = _version_key(user_id, platform)
+    new_version = uuid.uuid4().hex
+    cache.set(_count_key(new_version), 0, timeout=settings.APPLIED_JOBS_INDEX_TIMEOUT)
+    if version is None:
+        # concurrent checks agree on one version, so no job is added to a version that's then overwritten
+        cache.add(version_key, new_version, timeout=settings.APPLIED_JOBS_INDEX_TIMEOUT)
+    else:
+        cache.set(version_key, new_version, timeout=settings.APPLIED_JOBS_INDEX_TIMEOUT)
+
+    version = cache.get(version_key)
+    if version is None:
+        return None, None
+    return version, cache.get(_count_key(version))
+
+
+def build_applied_jobs_index(user_id: int, platform: str) -> BloomFilter:
+    job_ids = list(
+        AppliedJob.objects.filter(user_id=user_id, platform=platform).order_by().values_list('job_id', flat=True).union(
+            ArchivedAppliedJob.objects.filter(
+                user_id=user_id, platform=platform
+            ).order_by().values_list('job_id', flat=True)
+        )
+    )
+    index = BloomFilter(capacity=len(job_ids) * 2 + settings.APPLIED_JOBS_INDEX_MIN_CAPACITY)
+    for job_id in job_ids:
+        index.add(job_id)
+
+    return index
+
+
+def _add_created_jobs(index: BloomFilter, version: str, index_count: int, count: int) -> bool:
+    """
+        Adds the jobs created since the filter was built to it, False when one of them was lost (evicted)
+        or the filter is too far behind or full, then it has to be rebuilt.
+    """
+    if count < index_count or count - index_count > settings.APPLIED_JOBS_INDEX_MAX_ADDED:
+        return False
+    if count == index_count:
+        return True
+
+    keys = [_added_job_key(version, number) for number in range(index_count + 1, count + 1)]
+    added_jobs = cache.get_many(keys)
+    if len(added_jobs) != len(keys) or index.count + len(keys) > index.capacity:
+        return False
+
+    for job_id in added_jobs.values():
+        index.add(job_id)
+    return True
+
+
+def filter_known_jobs(user_id: int, platform: str, job_ids: Iterable[str]) -> Set[str]:
+    """
+        Returns the job ids the user may have a job row for (any status, archived too), every other job id
+        certainly has none, so only the returned ones need to be looked up in the DB.
+        The per user Bloom filter is stored with its version and the number of created jobs it includes,
+        the jobs created since (see remember_job) are added to it, and it's only rebuilt from the DB
+        when it's missing, its version has changed or one of the created jobs was lost from the cache.
+    """
+    index_key, version_key = _index_key(user_id, platform), _version_key(user_id, platform)
+    cached = cache.get_many([index_key, version_key])
+    version, count = _get_version(user_id, platform, cached.get(version_key))
+
+    index = None
+    if index_key in cached and count is not None:
+        index_version, index_count, index = cached[index_key]
+        if index_version != version or not _add_created_jobs(index, version, index_count, count):
+            index = None
+        elif index_count != count:
+            cache.set(index_key, (version, count, index), timeout=settings.APPLIED_JOBS_INDEX_TIMEOUT)
+
+    if index is None:
+        # the count is read before the DB, so the jobs created meanwhile are added again at the next check
+        index = build_applied_jobs_index(user_id, platform)
+        if count is not None:
+            cache.set(index_key, (version, count, index), timeout=settings.APPLIED_JOBS_INDEX_TIMEOUT)
+
+    return {job_id for job_id in job_ids if job_id in index}
+
+
+def remember_job(applied_job: AppliedJob) -> None:
+    """
+        Numbers the created job in the user's index version once its transaction commits,
+        so the next check adds it to the cached filter instead of rebuilding it.
+    """
+    user_id, platform, job_id = applied_job.user_id, applied_job.platform, applied_job.job_id
+
+    def add_job():
+        version = cache.get(_version_key(user_id, platform))
+        if version is None:
+            # the next check starts a new version and builds the filter from the DB
+            return
+        try:
+            number = cache.incr(_count_key(version))
+        except ValueError:
+            # the counter was lost, the next check replaces the version
+            return
+        cache.set(_added_job_key(version, number), job_id, timeout=settings.APPLIED_JOBS_INDEX_TIMEOUT)
+
+    transaction.on_commit(add_job)
@@ -0,0 +1,79 @@
+from typing import List, Tuple, Union
+
+from django.db import connection, transaction
+from django.db.models import QuerySet, Value
+
+from apps.job_applying.enums import JobStatuses
+from apps.job_applying.models import AppliedJob, AppliedJobQA, ArchivedAppliedJob, ArchivedAppliedJobQA
+from apps.job_applying.utils import with_answers
+
+JOB_FIELDS = (
+    'id', 'user_id', 'title', 'job_url', 'used_subscription_id', 'job_id', 'platform', 'status',
+    'company', 'powered_by', 'created_at', 'updated_at'
+)
+ANSWER_FIELDS = (
+    'id', 'job_id', 'question', 'answer', 'answer_options', 'prefilled_answer', 'created_at', 'updated_at'
+)
+
+
+@transaction.atomic
+def archive_applied_jobs_batch(created_before, batch_size: int) -> Tuple[int, int]:
+    """
+        Moves one batch of finished jobs created before the given time, with their answers,
+        to the archive tables. Every batch is committed on its own, so an interrupted run
+        is resumed by running it again.
+        Returns the numbers of archived jobs and answers.
+    """
+    jobs = list(AppliedJob.objects.select_for_update().filter(
+        created_at__lt=created_before,
+        status__in=(JobStatuses.APPLIED, JobStatuses.FAILED, JobStatuses.CANCELED)
+    ).order_by('id').values(*JOB_FIELDS)[:batch_size])
+    if not jobs:
+        return 0, 0
+
+    ids = [job['id'] for job in jobs]
+    answers = list(AppliedJobQA.objects.filter(job_id__in=ids).values(*ANSWER_FIELDS))
+
+    ArchivedAppliedJob.objects.bulk_create((ArchivedAppliedJob(**job) for job in jobs), ignore_conflicts=True)
+    ArchivedAppliedJobQA.objects.bulk_create(
+        (ArchivedAppliedJobQA(**answer) for answer in answers), ignore_conflicts=True
+    )
+
+    AppliedJobQA.objects.filter(job_id__in=ids).delete()
+    # deleted with plain SQL, archived jobs keep counting in the subscription usage counters
+    # which are moved by the AppliedJob delete signal
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {AppliedJob._meta.db_table} WHERE id IN ({", ".join(["%s"] * len(ids))})', ids
+        )
+
+    return len(jobs), len(answers)
+
+
+def union_with_archived(jobs: QuerySet, archived_jobs: QuerySet, ordering: List[str]) -> QuerySet:
+    """
+        Combines the filtered live and archived jobs querysets into a single ordered one
+        of {'id', 'archived', <ordering fields>} rows, so it can be paginated in the DB.
+    """
+    fields = ['id', *{field.lstrip('-') for field in ordering} - {'id'}]
+    jobs = jobs.order_by().annotate(archived=Value(False)).values(*fields, 'archived')
+    archived_jobs = archived_jobs.order_by().annotate(archived=Value(True)).values(*fields, 'archived')
+
+    return jobs.union(archived_jobs, all=True).order_by(*ordering, '-id')
+
+
+def load_union_rows(rows, include_answers: bool) -> List[Union[AppliedJob, ArchivedAppliedJob]]:
+    """
+        Loads the jobs of the union_with_archived rows, keeping the rows order,
+        with their answers or only their number (see with_answers).
+    """
+    ids = {False: [], True: []}
+    for row in rows:
+        ids[row['archived']].append(row['id'])
+
+    jobs = {
+        False: with_answers(AppliedJob.objects, include_answers).in_bulk(ids[False]) if ids[False] else {},
+        True: with_answers(ArchivedAppliedJob.objects, include_answers).in_bulk(ids[True]) if ids[True] else {},
+    }
+
+    return [jobs[row['archived']][row['id']] for row in rows]
@@ -0,0 +1,75 @@
+import re
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.user.models import User, UserJobSearchFilter
+
+LEGAL_SUFFIXES = frozenset((
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company',
+    'plc', 'gmbh', 'ag', 'sa', 'sas', 'srl', 'spa', 'bv', 'nv', 'pty', 'pvt', 'oy', 'ab',
+))
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_company_name(name: str) -> str:
+    """
+        Case folds the name, replaces punctuation with spaces and strips trailing legal suffixes,
+        ex. "Acme, Inc." -> "acme", "ACME Co. Ltd" -> "acme".
+    """
+    tokens = _NON_WORD.sub(' ', name.casefold()).split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+
+    return ' '.join(tokens)
+
+
+class CompanyMatcher:
+    """
+        Matches company names against the normalized excluded companies of a user.
+        Exact matches are set lookups, with substring matching an excluded name also
+        matches as whole words inside a longer name (ex. "acme" in "acme robotics"),
+        all names are checked by one precompiled pattern.
+    """
+
+    def __init__(self, excluded_companies: Iterable[str], substring: bool = False):
+        self.names = frozenset(filter(None, (normalize_company_name(c) for c in excluded_companies if c)))
+        self.pattern = None
+        if substring and self.names:
+            alternatives = '|'.join(re.escape(n) for n in sorted(self.names, key=len, reverse=True))
+            self.pattern = re.compile(rf'\b(?:{alternatives})\b')
+
+    def matches(self, company: str) -> bool:
+        name = normalize_company_name(company or '')
+        if not name:
+            return False
+
+        return name in self.names or bool(self.pattern and self.pattern.search(name))
+
+
+def _cache_key(user_id: int) -> str:
+    return f'company_matcher_{user_id}'
+
+
+def get_company_matcher(user: User) -> CompanyMatcher:
+    """
+        Returns the user's matcher from the cache, it is built from the excluded companies filter on a miss
+        and deleted when the user saves the job search filters (see invalidate_company_matcher).
+    """
+    matcher = cache.get(_cache_key(user.id))
+    if matcher is None:
+        excluded_companies = UserJobSearchFilter.objects.filter(
+            user=user, job_search_filter__filter_name='excluded_companies'
+        ).values_list('values', flat=True).first()
+        matcher = CompanyMatcher(
+            excluded_companies or [], substring=settings.EXCLUDED_COMPANIES_SUBSTRING_MATCH
+        )
+        cache.set(_cache_key(user.id), matcher, timeout=settings.COMPANY_MATCHER_CACHE_TIMEOUT)
+
+    return matcher
+
+
+def invalidate_company_matcher(user_id: int):
+    cache.delete(_cache_key(user_id))
@@ -0,0 +1,210 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from django.db.models import Value
+from rest_framework.exceptions import APIException
+
+from apps.job_applying.enums import JobSearchPlatforms, JobStatuses
+from apps.job_applying.exceptions import RequiresActiveSubscriptionException, DuplicateApplyException, \
+    ApplyingToExcludedCompanyJobException, JobSubmissionsDelayException, AlreadyExistsPendingJobException
+from apps.job_applying.models import AppliedJob, ArchivedAppliedJob
+from apps.job_applying.services.applied_jobs_index import filter_known_jobs
+from apps.job_applying.services.company_matcher import CompanyMatcher, get_company_matcher
+from apps.job_applying.utils import validate_usage, validate_powered_by, get_job_submission_wait
+from apps.payment.snapshots import get_subscription_snapshot
+from apps.user.models import User
+
+
+@dataclass
+class EligibilityVerdict:
+    """
+        Result of an apply-eligibility check, reasons holds the exceptions of all failed rules in rule order.
+    """
+    reasons: List[APIException] = field(default_factory=list)
+
+    @property
+    def eligible(self) -> bool:
+        return not self.reasons
+
+    def collect(self, rule: Callable, *args, **kwargs) -> None:
+        """
+            Runs a validation rule, its exception is recorded instead of being raised.
+        """
+        try:
+            rule(*args, **kwargs)
+        except APIException as e:
+            self.reasons.append(e)
+
+    def as_list(self) -> List[dict]:
+        return [
+            {
+                "code": reason.default_code,
+                "detail": str(reason.detail.get('detail', '') if isinstance(reason.detail, dict) else reason.detail),
+                **({"retry_after": reason.wait} if getattr(reason, 'wait', None) else {})
+            }
+            for reason in self.reasons
+        ]
+
+    def raise_first(self) -> None:
+        """
+            Raises the exception of the first failed rule, the response lists all failed rules in "reasons".
+        """
+        if self.eligible:
+            return
+
+        exception = self.reasons[0]
+        detail = exception.detail if isinstance(exception.detail, dict) else {'detail': exception.detail}
+        exception.detail = {**detail, 'reasons': self.as_list()}
+        raise exception
+
+
+@dataclass(frozen=True)
+class JobApplyState:
+    """
+        Everything the eligibility rules need to know about the user and the checked jobs.
+    """
+    job_statuses: Dict[str, str]
+    submission_wait: int
+    company_matcher: CompanyMatcher
+
+
+def load_job_apply_state(user: User, job_ids: List[str], platform: str) -> JobApplyState:
+    """
+        Loads the statuses of the jobs, the submission cooldown and the excluded companies matcher.
+        Everything but the statuses comes from the cache and statuses are read (one job_id IN (...)
+        query) only for the jobs the applied jobs index can't rule out.
+    """
+    known_job_ids = filter_known_jobs(user.id, platform, job_ids)
+
+    job_statuses = {}
+    if known_job_ids:
+        # a job may have both a live and an archived row when the archived one was canceled,
+        # an applied (or failed) row wins wherever it lives, otherwise the live one does
+        jobs = AppliedJob.objects.filter(
+            user=user, platform=platform, job_id__in=known_job_ids
+        ).order_by().annotate(archived=Value(False)).values_list('job_id', 'status', 'archived')
+        archived_jobs = ArchivedAppliedJob.objects.filter(
+            user=user, platform=platform, job_id__in=known_job_ids
+        ).order_by().annotate(archived=Value(True)).values_list('job_id', 'status', 'archived')
+        for job_id, status, archived in jobs.union(archived_jobs, all=True):
+            if job_statuses.get(job_id) in (JobStatuses.APPLIED, JobStatuses.FAILED):
+                continue
+            if archived and job_id in job_statuses and status not in (JobStatuses.APPLIED, JobStatuses.FAILED):
+                continue
+            job_statuses[job_id] = status
+
+    return JobApplyState(
+        job_statuses=job_statuses,
+        submission_wait=get_job_submission_wait(user.id),
+        company_matcher=get_company_matcher(user),
+    )
+
+
+def check_subscription(user: User) -> List[APIException]:
+    """
+        Returns the errors of the subscription rules: active subscription and plan limits.
+    """
+    verdict = EligibilityVerdict()
+
+    subscription = get_subscription_snapshot(user)
+    if not subscription:
+        verdict.reasons.append(RequiresActiveSubscriptionException())
+    else:
+        verdict.collect(
+            validate_usage,
+            total_limit=subscription.total_job_submissions,
+            used=subscription.used_job_submissions,
+            daily_limit=subscription.daily_job_applications,
+            today_used=subscription.today_used_applications
+        )
+
+    return verdict.reasons
+
+
+def evaluate_job_eligibility(
+        subscription_errors: List[APIException],
+        state: JobApplyState,
+        job_id: str,
+        powered_by: str,
+        company: str,
+        platform: str,
+        check_pending: bool
+) -> EligibilityVerdict:
+    """
+        Evaluates the rules of one job in memory, errors are reported in this order:
+            - active subscription and plan limits
+            - the company is not excluded by the user
+            - the job wasn't applied or failed already
+            - LinkedIn jobs are powered by a supported platform
+            - the submission delay passed
+            - there is no pending (created) job, when check_pending is set
+    """
+    verdict = EligibilityVerdict(reasons=list(subscription_errors))
+    job_status = state.job_statuses.get(job_id)
+
+    if company and state.company_matcher.matches(company):
+        verdict.reasons.append(ApplyingToExcludedCompanyJobException())
+
+    if job_status in (JobStatuses.APPLIED, JobStatuses.FAILED):
+        verdict.reasons.append(DuplicateApplyException())
+
+    if platform == JobSearchPlatforms.LINKEDIN.value:
+        verdict.collect(validate_powered_by, powered_by)
+
+    if state.submission_wait:
+        verdict.reasons.append(JobSubmissionsDelayException(wait=state.submission_wait))
+
+    if check_pending and job_status == JobStatuses.CREATED:
+        verdict.reasons.append(AlreadyExistsPendingJobException())
+
+    return verdict
+
+
+def check_job_eligibility(
+        user: User,
+        job_id: str,
+        powered_by: str,
+        company: str,
+        platform: JobSearchPlatforms = JobSearchPlatforms.LINKEDIN,
+        check_pending: bool = True,
+) -> EligibilityVerdict:
+    """
+        Evaluates every apply rule of the job with at most two queries
+        (the subscription snapshot and the job status when the applied jobs index can't rule it out).
+    """
+    return evaluate_job_eligibility(
+        subscription_errors=check_subscription(user),
+        state=load_job_apply_state(user, [job_id], platform),
+        job_id=job_id,
+        powered_by=powered_by,
+        company=company,
+        platform=platform,
+        check_pending=check_pending
+    )
+
+
+def check_jobs_eligibility(
+        user: User,
+        jobs: List[dict],
+        platform: JobSearchPlatforms = JobSearchPlatforms.LINKEDIN
+) -> List[Tuple[dict, EligibilityVerdict]]:
+    """
+        Evaluates the apply rules of many jobs ({job_id, company, powered_by}) with at most two queries,
+        the same as check_job_eligibility does for one job.
+        Returns (job, verdict) pairs in the order of the given jobs.
+    """
+    subscription_errors = check_subscription(user)
+    state = load_job_apply_state(user, list({job['job_id'] for job in jobs}), platform)
+
+    return [
+        (job, evaluate_job_eligibility(
+            subscription_errors=subscription_errors,
+            state=state,
+            job_id=job['job_id'],
+            powered_by=job.get('powered_by'),
+            company=job.get('company'),
+            platform=platform,
+            check_pending=True
+        ))
+        for job in jobs
+    ]
@@ -1,6 +1,6 @@
 import docx
 from apps.core.exceptions import LogicException
-from apps.user.models import User, UserResume
+from apps.user.models import User
 from PyPDF2 import PdfReader
 
 
@@ -24,7 +24,11 @@ class UserInfoCollector:
         return info
 
     def resume_as_text(self) -> str:
-        return ResumeReader(resume=self.user.selected_resume).read()
+        resume = self.user.selected_resume
+        if resume.text is not None:
+            return resume.text
+
+        return ResumeReader(resume.file.file, resume.extension).read()
 
     def additional_questions_as_text(self) -> str:
         return  ("\n Here is additional information about me. \n"
@@ -41,20 +45,24 @@ class UserInfoCollector:
         """
 
 class ResumeReader:
-    def __init__(self, resume: UserResume):
-        self.resume = resume
+    def __init__(self, file, extension: str):
+        self.file = file
+        self.extension = extension
+        self.page_count = None
 
     def read(self):
-        if self.resume.is_pdf:
+        if self.extension == '.pdf':
             return self.read_pdf()
 
-        if self.resume.is_docx:
+        if self.extension == '.docx':
             return self.read_docx()
 
         raise Exception("Unknown resume extension")
 
     def read_pdf(self):
-        reader = PdfReader(self.resume.file.file)
+        self.file.seek(0)
+        reader = PdfReader(self.file)
+        self.page_count = len(reader.pages)
         raw_text = ''
         for i, page in enumerate(reader.pages):
             text = page.extract_text()
@@ -64,10 +72,10 @@ class ResumeReader:
         return raw_text
 
     def read_docx(self):
-        doc = docx.Document(self.resume.file.file)
+        self.file.seek(0)
+        doc = docx.Document(self.file)
         raw_text = []
         for para in doc.paragraphs:
             raw_text.append(para.text)
 
         return '\n'.join(raw_text)
-
@@ -0,0 +1,46 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.job_applying.enums import JobStatuses
+from apps.job_applying.exceptions import RequiresActiveSubscriptionException
+from apps.job_applying.models import AppliedJob
+from apps.job_applying.utils import validate_usage
+from apps.payment.models import Subscription
+from apps.payment.snapshots import get_subscription_snapshot
+from apps.user.models import User
+
+
+def reserve_job_submission(user: User) -> Subscription:
+    """
+        Reserves a job submission slot of the user's active subscription.
+        Must be called inside transaction.atomic together with the job creation:
+        the subscription row stays locked until the created job is committed,
+        so parallel requests of the same user are checked one after another
+        while requests of other users are not blocked.
+        Jobs with status CREATED hold their slot, it is released when the job
+        turns FAILED or CANCELED and consumed when it turns APPLIED.
+        Raises:
+            RequiresActiveSubscriptionException: If the user does not have an active subscription.
+            PlanLimitExceededException: If the reservation would exceed the total or daily limit of the plan.
+        Returns the locked subscription.
+    """
+    snapshot = get_subscription_snapshot(user)
+    subscription = snapshot and Subscription.objects.select_for_update().filter(
+        pk=snapshot.subscription_id, active=True
+    ).first()
+    if not subscription:
+        raise RequiresActiveSubscriptionException()
+
+    pending = AppliedJob.objects.filter(used_subscription=subscription, status=JobStatuses.CREATED).aggregate(
+        total=Count('id'),
+        today=Count('id', filter=Q(created_at__date__gte=timezone.localdate())),
+    )
+
+    validate_usage(
+        total_limit=subscription.total_job_submissions,
+        used=subscription.used_jobs_submissions + pending['total'],
+        daily_limit=subscription.daily_job_applications,
+        today_used=subscription.today_used_applications + pending['today'],
+    )
+
+    return subscription
@@ -0,0 +1,72 @@
+from collections import defaultdict
+from typing import List
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.exceptions import BaseValidationError, BaseNotFoundError
+from apps.job_applying.enums import JobStatuses, JOB_STATUS_TRANSITIONS
+from apps.job_applying.models import AppliedJob
+from apps.payment.quota_status import invalidate_quota_status
+from apps.payment.snapshots import get_subscription_snapshot
+from apps.payment.utils import update_subscription_usage, set_subscription_expired
+from apps.user.models import User
+
+
+def is_transition_allowed(current_status: str, status: str) -> bool:
+    """
+        Keeping the status is always allowed, jobs may leave the created status only (JOB_STATUS_TRANSITIONS),
+        so a slot released by a failed or canceled job can't be consumed again.
+    """
+    return status == current_status or status in JOB_STATUS_TRANSITIONS[current_status]
+
+
+@transaction.atomic
+def apply_status_transitions(user: User, transitions: List[dict]) -> List[AppliedJob]:
+    """
+        Moves the user's jobs to new statuses ([{id, status}]) with one UPDATE.
+        Jobs are locked while the transitions are validated, bulk_update sends no signals,
+        so usage counters are moved once per subscription and the quota status is invalidated here.
+        The subscription is expired when its job submissions are used up, as UpdateAppliedJob does.
+        Raises:
+            BaseNotFoundError: If some of the jobs don't exist or belong to another user.
+            BaseValidationError: If some of the transitions aren't allowed.
+        Returns the updated jobs.
+    """
+    statuses = {transition['id']: transition['status'] for transition in transitions}
+    jobs = AppliedJob.objects.select_for_update().filter(user=user).in_bulk(list(statuses.keys()))
+
+    missing = sorted(set(statuses) - set(jobs))
+    if missing:
+        raise BaseNotFoundError(f"Jobs not found: {missing}")
+
+    not_allowed = sorted(pk for pk, job in jobs.items() if not is_transition_allowed(job.status, statuses[pk]))
+    if not_allowed:
+        raise BaseValidationError(f"Status transition isn't allowed for jobs: {not_allowed}")
+
+    changed = [job for pk, job in jobs.items() if statuses[pk] != job.status]
+    if not changed:
+        return list(jobs.values())
+
+    today = timezone.localdate()
+    deltas = defaultdict(lambda: [0, 0])
+    now = timezone.now()
+    for job in changed:
+        delta = (statuses[job.pk] == JobStatuses.APPLIED) - (job.status == JobStatuses.APPLIED)
+        deltas[job.used_subscription_id][0] += delta
+        if timezone.localtime(job.created_at).date() == today:
+            deltas[job.used_subscription_id][1] += delta
+        job.status = job.loaded_status = statuses[job.pk]
+        job.updated_at = now
+
+    AppliedJob.objects.bulk_update(changed, ['status', 'updated_at'])
+
+    for subscription_id, (applied_delta, today_delta) in deltas.items():
+        update_subscription_usage(subscription_id, applied_delta, today_delta)
+    invalidate_quota_status(user.id)
+
+    subscription = get_subscription_snapshot(user, refresh=True)
+    if subscription and subscription.possible_job_submissions <= 0:
+        set_subscription_expired(subscription.subscription_id)
+
+    return list(jobs.values())
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.job_applying.enums import JobStatuses
+from apps.job_applying.models import AppliedJob
+from apps.job_applying.services.applied_jobs_index import remember_job
+from apps.payment.quota_status import invalidate_quota_status
+from apps.payment.utils import update_subscription_usage
+
+
+def move_usage_counters(applied_job: AppliedJob, delta: int):
+    created_today = timezone.localtime(applied_job.created_at).date() == timezone.localdate()
+    update_subscription_usage(
+        subscription_id=applied_job.used_subscription_id,
+        applied_delta=delta,
+        today_delta=delta if created_today else 0
+    )
+    invalidate_quota_status(applied_job.user_id)
+
+
+@receiver(post_save, sender=AppliedJob)
+def applied_job_status_changed(sender, instance, created, **kwargs):
+    previous_status = None if created else instance.loaded_status
+    if created:
+        remember_job(instance)
+
+    if previous_status == instance.status:
+        return
+
+    move_usage_counters(
+        instance, (instance.status == JobStatuses.APPLIED) - (previous_status == JobStatuses.APPLIED)
+    )
+    instance.loaded_status = instance.status
+
+
+@receiver(post_delete, sender=AppliedJob)
+def applied_job_deleted(sender, instance, **kwargs):
+    if instance.loaded_status == JobStatuses.APPLIED:
+        move_usage_counters(instance, -1)
@@ -1,3 +1,304 @@
-from django.test import TestCase
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from rest_framework.test import APIClient
+
+from apps.job_applying.enums import JobStatuses
+from apps.job_applying.models import AppliedJob, AppliedJobQA
+from apps.payment.models import Plan, PlanOption, Subscription
+from apps.user.models import User
+
+
+def create_subscribed_user(email: str, job_applications: int = 10, job_applications_per_day: int = 10) -> User:
+    with mock.patch('apps.user.signals.CustomerService') as customer_service, \
+            mock.patch('apps.user.signals.send_verification_email'):
+        customer_service.return_value.create_customer.return_value.id = 'cus_test'
+        user = User.objects.create_user(email=email, password='password')
+
+    plan, _ = Plan.objects.get_or_create(slug=Plan.PlanSlugs.PRO, defaults={'name': 'Pro', 'amount': 10})
+    plan.options.all().delete()
+    PlanOption.objects.bulk_create([
+        PlanOption(plan=plan, text='Applications', type=PlanOption.PlanOptionTypes.JOB_APPLICATIONS,
+                   value=job_applications),
+        PlanOption(plan=plan, text='Per day', type=PlanOption.PlanOptionTypes.JOB_APPLICATIONS_PER_DAY,
+                   value=job_applications_per_day),
+    ])
+    Subscription.objects.create(plan=plan, user=user)
+    # plan options were bulk created, no signal invalidated the process local limits
+    cache.clear()
+
+    return user
+
+
+def job_data(job_id: str) -> dict:
+    return {
+        'job_id': job_id,
+        'platform': 'linkedin',
+        'powered_by': 'Linkedin',
+        'job_url': 'https://www.linkedin.com/jobs/view/1',
+        'title': 'Python Developer',
+        'company': 'Acme',
+    }
+
+
+class VerifyCanApplyQueriesTestCase(TestCase):
+    """
+        The subscription snapshot is loaded once per request, limits come from the process local plan catalog
+        and the applied job ids from the cached index, so the checks don't query per limit.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_subscribed_user('verify@example.com')
+        self.client = APIClient()
+        self.authenticate()
+        AppliedJob.objects.create(
+            user=self.user, used_subscription=self.user.active_subscription, status=JobStatuses.APPLIED,
+            **{key: value for key, value in job_data('applied').items() if key != 'powered_by'}
+        )
+        # warms up the plan limits and the applied jobs index
+        self.verify('unknown')
+
+    def authenticate(self):
+        # a fresh user per request as the authentication would load, the snapshot is memoized on it
+        self.client.force_authenticate(User.objects.get(pk=self.user.pk))
+
+    def verify(self, job_id):
+        return self.client.get(f'/api/v1/job-apply/verify-can-apply/{job_id}/linkedin', {'powered_by': 'Linkedin'})
+
+    def test_unknown_job(self):
+        self.authenticate()
+        with self.assertNumQueries(1):
+            response = self.verify('unknown')
+        self.assertEqual(response.status_code, 200)
+
+    def test_applied_job(self):
+        self.authenticate()
+        with self.assertNumQueries(2):
+            response = self.verify('applied')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk(self):
+        self.authenticate()
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                '/api/v1/job-apply/verify-can-apply-bulk/linkedin/',
+                {'jobs': [{'job_id': str(index), 'powered_by': 'Linkedin'} for index in range(25)] + [
+                    {'job_id': 'applied', 'powered_by': 'Linkedin'}
+                ]},
+                format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_created_job_is_added_to_cached_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/job-apply/create/', job_data('created'), format='json')
+        self.assertEqual(response.status_code, 201)
+
+        # the filter isn't rebuilt, the created job is added to it and then looked up
+        self.authenticate()
+        with self.assertNumQueries(1):
+            self.verify('unknown')
+        self.authenticate()
+        with self.assertNumQueries(2):
+            self.verify('created')
+
+    def test_lost_index_version_rebuilds_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/v1/job-apply/create/', job_data('created'), format='json')
+        cache.delete(f'applied_jobs_index_version_{self.user.pk}_linkedin')
+
+        self.authenticate()
+        with self.assertNumQueries(3):
+            response = self.verify('created')
+        self.assertEqual(response.status_code, 409)
+
+
+class AppliedJobIndexesTestCase(TestCase):
+    """
+        The hot applied_jobs queries are served by the indexes of migration 0008.
+    """
+
+    def setUp(self):
+        self.users = [create_subscribed_user(f'indexes-{index}@example.com') for index in range(2)]
+        AppliedJob.objects.bulk_create([
+            AppliedJob(
+                user=user, used_subscription=user.active_subscription, job_id=f'{user.pk}-{index}',
+                platform='linkedin', title='Python Developer', job_url='https://www.linkedin.com/jobs/view/1',
+                status=(JobStatuses.CREATED, JobStatuses.APPLIED, JobStatuses.FAILED)[index % 3]
+            )
+            for user in self.users for index in range(50)
+        ])
+
+    def test_user_jobs_list(self):
+        plan = AppliedJob.objects.filter(user=self.users[0]).order_by('-created_at', '-id')[:25].explain()
+        self.assertIn('applied_jobs_user_created_idx', plan)
+
+    def test_pending_jobs_of_subscription(self):
+        plan = AppliedJob.objects.filter(
+            used_subscription=self.users[0].active_subscription, status=JobStatuses.CREATED
+        ).explain()
+        self.assertIn('applied_jobs_subscription_idx', plan)
+
+
+class AppliedJobsListQueriesTestCase(TestCase):
+    """
+        The list counts the answers instead of loading them, so the number of queries doesn't grow with the page.
+    """
+
+    def setUp(self):
+        self.user = create_subscribed_user('list@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        AppliedJob.objects.bulk_create([
+            AppliedJob(
+                user=self.user, used_subscription=self.user.active_subscription, job_id=str(index),
+                platform='linkedin', title='Python Developer', job_url='https://www.linkedin.com/jobs/view/1',
+                status=JobStatuses.APPLIED
+            )
+            for index in range(30)
+        ])
+        jobs = list(AppliedJob.objects.filter(user=self.user))
+        AppliedJobQA.objects.bulk_create([
+            AppliedJobQA(job=job, question='Years of experience?', answer='5') for job in jobs for _ in range(2)
+        ])
+        self.job = jobs[0]
+
+    def test_compact_list(self):
+        with self.assertNumQueries(2) as queries:
+            response = self.client.get('/api/v1/job-apply/jobs/', {'page_size': 30})
+        count_sql, page_sql = (query['sql'] for query in queries.captured_queries)
+        # the answers are only counted for the page rows, by a correlated subquery
+        self.assertNotIn('JOIN', count_sql)
+        self.assertNotIn('applied_job_question_answers', count_sql)
+        self.assertNotIn('JOIN', page_sql)
+        self.assertEqual(len(response.data['results']), 30)
+        self.assertNotIn('answers', response.data['results'][0])
+        self.assertEqual(response.data['results'][0]['answers_count'], 2)
+
+    def test_list_with_answers(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/job-apply/jobs/', {'page_size': 30, 'include': 'answers'})
+        self.assertEqual(len(response.data['results'][0]['answers']), 2)
+
+    def test_cursor_list(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/job-apply/jobs/', {'page_size': 30, 'pagination': 'cursor'})
+        self.assertEqual(len(response.data['results']), 30)
+
+    def test_detail(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/v1/job-apply/jobs/{self.job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['answers']), 2)
+
+
+class UpdateAppliedJobTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_subscribed_user('update@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_released_slot_cannot_be_applied(self):
+        response = self.client.post('/api/v1/job-apply/create/', job_data('1'), format='json')
+        self.assertEqual(response.status_code, 201)
+        job_id = response.data['id']
+
+        response = self.client.patch(f'/api/v1/job-apply/update/{job_id}/', {'status': JobStatuses.CANCELED})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.patch(f'/api/v1/job-apply/update/{job_id}/', {'status': JobStatuses.APPLIED})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(AppliedJob.objects.get(pk=job_id).status, JobStatuses.CANCELED)
+
+    def test_reapplied_canceled_job_drops_previous_answers(self):
+        job_id = self.client.post('/api/v1/job-apply/create/', job_data('1'), format='json').data['id']
+        AppliedJobQA.objects.create(job_id=job_id, question='Years of experience?', answer='5')
+        self.client.patch(f'/api/v1/job-apply/update/{job_id}/', {'status': JobStatuses.CANCELED})
+
+        response = self.client.post('/api/v1/job-apply/create/', job_data('1'), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['id'], job_id)
+        self.assertFalse(AppliedJobQA.objects.filter(job_id=job_id).exists())
+
+
+class IdempotentJobCreationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_subscribed_user('idempotent@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create(self):
+        return self.client.post('/api/v1/job-apply/create/', job_data('1'), format='json', HTTP_IDEMPOTENCY_KEY='key')
+
+    def test_response_is_replayed(self):
+        first, second = self.create(), self.create()
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(AppliedJob.objects.filter(user=self.user).count(), 1)
+
+    def test_failed_request_can_be_retried(self):
+        with mock.patch('apps.job_applying.views.CreateAppliedJobAPIView.create_job', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.create()
+        self.assertEqual(self.create().status_code, 201)
+
+    def test_key_of_dead_request_can_be_retried(self):
+        # a killed worker doesn't run the cleanup, its in progress marker only expires
+        with mock.patch('apps.job_applying.views.CreateAppliedJobAPIView.create_job', side_effect=SystemExit):
+            with self.assertRaises(SystemExit):
+                self.create()
+        self.assertEqual(self.create().status_code, 409)
+
+        expired_at = time.time() + settings.IDEMPOTENCY_LOCK_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=expired_at):
+            self.assertEqual(self.create().status_code, 201)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+@override_settings(JOB_APPLYING_INTERVAL=0)
+class ParallelJobCreationTestCase(TransactionTestCase):
+    """
+        Parallel creates of one user must not reserve more job submissions than the plan allows,
+        the subscription row lock serializes them. It needs SELECT ... FOR UPDATE, so it runs on MySQL
+        (the CI workflow) and is skipped on SQLite.
+    """
+    requests_count = 8
+    job_applications = 3
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_subscribed_user('parallel@example.com', job_applications=self.job_applications)
+
+    def test_parallel_creates_respect_plan_limit(self):
+        barrier = threading.Barrier(self.requests_count)
+        status_codes = []
+
+        def create(index):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            try:
+                barrier.wait()
+                status_codes.append(
+                    client.post('/api/v1/job-apply/create/', job_data(f'parallel-{index}'), format='json').status_code
+                )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=create, args=(index, )) for index in range(self.requests_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(status_codes.count(201), self.job_applications)
+        self.assertEqual(len(status_codes), self.requests_count)
+        self.assertEqual(AppliedJob.objects.filter(user=self.user).count(), self.job_applications)
@@ -1,54 +1,35 @@
-import datetime
+import math
+import time
 
 from typing import Union
 from django.conf import settings
-from django.utils import timezone
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 
 from apps.core.exceptions import BaseValidationError, BaseNotFoundError
 from apps.job_applying.enums import JobSearchPlatforms, LinkedinPoweredByChoices, JobStatuses
 from apps.job_applying.exceptions import PlanLimitExceededException, RequiresActiveSubscriptionException, \
-    JobSubmissionsDelayException, DuplicateApplyException, ApplyingToExcludedCompanyJobException
+    JobSubmissionsDelayException
 from apps.job_applying.models import AppliedJob, AppliedJobQA
+from apps.payment.snapshots import get_subscription_snapshot
 from apps.user.models import User, UserJobSearchFilter
 
 
-def verify_user_can_apply_to_job(
-        user: User,
-        job_id: str,
-        powered_by: str,
-        company: str,
-        platform: JobSearchPlatforms = JobSearchPlatforms.LINKEDIN,
-) -> None:
+def with_answers(queryset: QuerySet, include_answers: bool) -> QuerySet:
     """
-       Verifies if a user can apply for a job based on the provided parameters.
-       Args:
-           user (User): The user attempting to apply for the job.
-           job_id: The ID of the job being applied for.
-           platform (str, optional): The platform from which the user is applying. Defaults is 'Linkedin'.
-           powered_by (str): If platform is LinkedIn job should be powered by particular companies.
-           company (str):
-       Raises:
-           DuplicateApplyException: If the user has applied for that job already or he has applied job with status created.
-       Returns:
-           None
-   """
-    if company:
-        validate_company(company=company, user=user)
-
-    job = AppliedJob.objects.filter(
-        user=user,
-        job_id=job_id,
-        platform=platform,
-        status__in=[JobStatuses.APPLIED, JobStatuses.FAILED]
-    ).exists()
-
-    if job:
-        raise DuplicateApplyException()
-
-    if platform == JobSearchPlatforms.LINKEDIN.value:
-        validate_powered_by(powered_by)
+        Prefetches the answers of the jobs (one query for all) when they are serialized,
+        otherwise only annotates their number as answers_count. The number is a correlated subquery
+        evaluated for the selected rows only, so counting or paginating the jobs doesn't join the answers.
+    """
+    if include_answers:
+        return queryset.prefetch_related('answers')
 
-    validate_job_submission_delay(user)
+    answers = queryset.model.answers
+    answers_count = answers.rel.related_model.objects.filter(
+        **{answers.field.name: OuterRef('pk')}
+    ).order_by().values(answers.field.name).annotate(count=Count('*')).values('count')
+    return queryset.annotate(answers_count=Coalesce(Subquery(answers_count), 0))
 
 
 def validate_plan_limits(user: User) -> None:
@@ -66,13 +47,26 @@ def validate_plan_limits(user: User) -> None:
                 limit for the plan or the daily job submissions limit for the plan.
 
         """
-    if not user.active_subscription:
+    subscription = get_subscription_snapshot(user)
+    if not subscription:
         raise RequiresActiveSubscriptionException()
 
-    if user.active_subscription.possible_job_submissions <= 0:
+    validate_usage(
+        total_limit=subscription.total_job_submissions,
+        used=subscription.used_job_submissions,
+        daily_limit=subscription.daily_job_applications,
+        today_used=subscription.today_used_applications
+    )
+
+
+def validate_usage(total_limit: int, used: int, daily_limit: int, today_used: int) -> None:
+    """
+        Raises PlanLimitExceededException when the total or the daily limit of the plan is reached.
+    """
+    if total_limit - used <= 0:
         raise PlanLimitExceededException("You already have exceeded job submissions limit for this plan")
 
-    if user.active_subscription.today_used_applications >= user.active_subscription.daily_job_applications:
+    if today_used >= daily_limit:
         raise PlanLimitExceededException("You already have exceeded daily job submissions limit for this plan")
 
 
@@ -95,41 +89,43 @@ def validate_powered_by(powered_by: str):
         )
 
 
-def validate_job_submission_delay(user: User) -> None:
+def _last_submission_key(user_id: int) -> str:
+    return f'last_job_submission_{user_id}'
+
+
+def get_job_submission_wait(user_id: int) -> int:
     """
-    This function validates whether a user is allowed to submit a job application based on a specified delay interval.
-    If a recent job submission is found, the function raises a ``JobSubmissionsDelayException``
-       to prevent further job submissions within the specified interval.
-   :param user: The user for whom the job submission delay is being validated.
-   :type user: User
-   :raises JobSubmissionsDelayException:If the user has submitted a job application within the configured delay interval.
+        Returns the seconds left until the user may submit the next job, 0 if allowed now.
+        The last submission time is read from the cache, it expires with the interval.
     """
-    j = AppliedJob.objects.filter(
-        user=user,
-        created_at__gte=timezone.now() - datetime.timedelta(seconds=settings.JOB_APPLYING_INTERVAL)
-    ).exists()
+    if not settings.JOB_APPLYING_INTERVAL:
+        return 0
+
+    last_submission = cache.get(_last_submission_key(user_id))
+    if last_submission is None:
+        return 0
 
-    if j:
-        raise JobSubmissionsDelayException()
+    return max(math.ceil(last_submission + settings.JOB_APPLYING_INTERVAL - time.time()), 0)
 
 
-def validate_company(company: str, user: User):
+def claim_job_submission(user_id: int) -> None:
     """
-        Validates whether the provided company is excluded based on the user's job search filters.
-        This function checks if the given company is present in the list of excluded companies
-        specified in the user's job search filters. If the company is found in the exclusion list,
-        an ApplyingToExcludedCompanyJobException is raised.
-        Args:
-            company (str): The name of the company to be validated.
-            user (User): The user for whom the company validation is being performed.
+        Stores the submission time unless a submission of the interval is already stored.
+        cache.add is atomic, so only one of parallel submissions gets through,
+        the claim is released with release_job_submission when the submission fails.
         Raises:
-            ApplyingToExcludedCompanyJobException: Raised when the provided company is found in the
-                list of excluded companies in the user's job search filters.
-        """
-    excluded_companies = user.job_search_filters.filter(job_search_filter__filter_name='excluded_companies').first()
+            JobSubmissionsDelayException: If the user has submitted a job within the interval.
+    """
+    if not settings.JOB_APPLYING_INTERVAL:
+        return
+
+    if not cache.add(_last_submission_key(user_id), time.time(), timeout=settings.JOB_APPLYING_INTERVAL):
+        raise JobSubmissionsDelayException(wait=max(get_job_submission_wait(user_id), 1))
+
 
-    if excluded_companies and company.lower() in [c.lower() for c in excluded_companies.values]:
-        raise ApplyingToExcludedCompanyJobException()
+def release_job_submission(user_id: int) -> None:
+    if settings.JOB_APPLYING_INTERVAL:
+        cache.delete(_last_submission_key(user_id))
 
 
 def save_answer(job: AppliedJob, question: str, answer: str, answer_options: list = None, prefilled_answer: str = None):
@@ -3,8 +3,12 @@ import urllib
 
 # Create your views here.
 import openai
-from django.http import HttpResponse, FileResponse
+from django.db import transaction
+from django.http import HttpResponse, FileResponse, HttpResponseRedirect
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag, http_date
 from rest_framework import status, filters
 from django_filters import rest_framework as filters
 from rest_framework.exceptions import NotFound
@@ -13,60 +17,179 @@ from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveAPIView,
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.core.decorators import request_logger
+from apps.core.decorators import request_logger, idempotent
 from apps.core.exceptions import BaseValidationError, BaseAPIException
-from apps.core.pagination import DynamicPageSizePagination
+from apps.core.pagination import DynamicPageSizePagination, KeysetPagination
 from apps.job_applying.decorators import active_plan_requires, plan_limits_check_requires
-from apps.job_applying.enums import JobSearchPlatforms
-from apps.job_applying.exceptions import OpenAIRateLimitException, AlreadyExistsPendingJobException
+from apps.job_applying.enums import JobSearchPlatforms, JobStatuses
+from apps.job_applying.exceptions import OpenAIRateLimitException, \
+    RequiresActiveSubscriptionException
 from apps.job_applying.filters import AppliedJobFilter
-from apps.job_applying.models import AppliedJob
-from apps.job_applying.serializers import AppliedJobSerializer, AppliedJobQASerializer
+from apps.job_applying.models import AppliedJob, ArchivedAppliedJob
+from apps.job_applying.serializers import AppliedJobSerializer, AppliedJobQASerializer, \
+    BulkJobEligibilitySerializer, BulkJobStatusUpdateSerializer, ArchivedAppliedJobSerializer, \
+    AppliedJobListSerializer, ArchivedAppliedJobListSerializer
+from apps.job_applying.services.archive import union_with_archived, load_union_rows
 from apps.job_applying.services.job_searching import job_search_builder_factory
+from apps.job_applying.services.eligibility import check_job_eligibility, check_jobs_eligibility
 from apps.job_applying.services.openai import QAService
-from apps.job_applying.utils import verify_user_can_apply_to_job, save_answer, user_job_titles, get_pending_job
+from apps.job_applying.services.quota import reserve_job_submission
+from apps.job_applying.services.transitions import apply_status_transitions, is_transition_allowed
+from apps.job_applying.utils import save_answer, user_job_titles, get_pending_job, with_answers, \
+    claim_job_submission, release_job_submission
+from apps.payment.quota_status import get_quota_status
+from apps.payment.snapshots import get_subscription_snapshot
 from apps.payment.utils import set_subscription_expired
+from apps.user.utils import get_resume_presigned_url
 
 logger = logging.getLogger('job_applying')
 
 
 class AppliedJobsListAPIView(ListAPIView):
-    serializer_class = AppliedJobSerializer
+    """
+        Lists the jobs with the number of their answers, ?include=answers adds the answers themselves.
+    """
+    serializer_class = AppliedJobListSerializer
     filter_backends = (filters.DjangoFilterBackend, SearchFilter, OrderingFilter)
     filterset_class = AppliedJobFilter
     pagination_class = DynamicPageSizePagination
+    # full-text (word prefix) search, see apps.core.lookups.FullTextSearch
     search_fields = [
-        'title',
+        '@title',
+        '@company',
     ]
 
     def get_queryset(self):
-        return AppliedJob.objects.filter(user=self.request.user).all()
+        # the id keeps the pages stable among jobs created at the same time
+        queryset = AppliedJob.objects.filter(user=self.request.user).order_by('-created_at', '-id')
+        if self.include_archived:
+            # only ids are selected from it, the page jobs are loaded by load_union_rows
+            return queryset
+
+        return with_answers(queryset, self.include_answers)
+
+    def get_serializer_class(self):
+        return AppliedJobSerializer if self.include_answers else AppliedJobListSerializer
+
+    @property
+    def include_answers(self) -> bool:
+        return 'answers' in self.request.query_params.get('include', '').split(',')
+
+    @property
+    def include_archived(self) -> bool:
+        return self.request.query_params.get('include_archived') == 'true'
 
     ordering_fields = ['id', 'title', 'company', 'status', 'company', 'created_at']
 
+    @property
+    def paginator(self):
+        """
+            ?pagination=cursor switches the live jobs list to the keyset pagination,
+            its order is fixed (newest first) so ?ordering doesn't apply to it.
+        """
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('pagination') == 'cursor' and not self.include_archived:
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+
+        return self._paginator
+
+    def list(self, request, *args, **kwargs):
+        if not self.include_archived:
+            return super().list(request, *args, **kwargs)
+
+        # filtered the same way as live jobs, the ordering is applied to the union of both
+        jobs = self.filter_queryset(self.get_queryset())
+        archived_jobs = ArchivedAppliedJob.objects.filter(user=request.user)
+        archived_jobs = AppliedJobFilter(request.query_params, queryset=archived_jobs, request=request).qs
+        archived_jobs = SearchFilter().filter_queryset(request, archived_jobs, self)
+        ordering = OrderingFilter().get_ordering(request, jobs, self) or AppliedJob._meta.ordering
+
+        rows = union_with_archived(jobs, archived_jobs, ordering)
+        page = self.paginate_queryset(rows)
+        serializer_class = self.get_serializer_class()
+        archived_serializer_class = (
+            ArchivedAppliedJobSerializer if self.include_answers else ArchivedAppliedJobListSerializer
+        )
+        data = [
+            archived_serializer_class(job).data if isinstance(job, ArchivedAppliedJob) else serializer_class(job).data
+            for job in load_union_rows(rows if page is None else page, self.include_answers)
+        ]
+
+        return Response(data) if page is None else self.get_paginated_response(data)
+
+
+class AppliedJobAPIView(RetrieveAPIView):
+    """
+        A job with its answers, archived jobs are looked up when it's not found among the live ones.
+    """
+    serializer_class = AppliedJobSerializer
+
+    def get_queryset(self):
+        return AppliedJob.objects.filter(user=self.request.user).prefetch_related('answers')
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_queryset().filter(pk=kwargs['pk']).first()
+        if job:
+            return Response(self.get_serializer(job).data)
+
+        archived_job = ArchivedAppliedJob.objects.filter(
+            user=request.user, pk=kwargs['pk']
+        ).prefetch_related('answers').first()
+        if not archived_job:
+            raise NotFound()
+
+        return Response(ArchivedAppliedJobSerializer(archived_job).data)
+
 
 class CreateAppliedJobAPIView(CreateAPIView):
     serializer_class = AppliedJobSerializer
 
     @request_logger(logger=logging.getLogger('job_applying'))
-    @active_plan_requires
-    @plan_limits_check_requires
+    @idempotent
     def post(self, request, *args, **kwargs):
-        verify_user_can_apply_to_job(
+        check_job_eligibility(
             user=request.user,
             job_id=request.data['job_id'],
             powered_by=request.data.get('powered_by'),
-            company=request.data.get('company')
-        )
-        serializer = self.serializer_class(data={
+            company=request.data.get('company'),
+            check_pending=False
+        ).raise_first()
+        claim_job_submission(request.user.id)
+        try:
+            with transaction.atomic():
+                serializer = self.create_job(request, reserve_job_submission(request.user))
+        except Exception:
+            # the job wasn't created, the next submission doesn't have to wait
+            release_job_submission(request.user.id)
+            raise
+
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+    def create_job(self, request, subscription):
+        # a canceled job is applied again by reusing its row, the job is unique per user and platform
+        canceled_job = AppliedJob.objects.filter(
+            user=request.user,
+            job_id=request.data['job_id'],
+            platform=request.data.get('platform', JobSearchPlatforms.LINKEDIN),
+            status=JobStatuses.CANCELED
+        ).first()
+        serializer = self.serializer_class(canceled_job, data={
             **request.data,
             "user": request.user.id,
-            "used_subscription": request.user.active_subscription.id
+            "used_subscription": subscription.id
         })
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        if canceled_job:
+            # the answers of the canceled attempt aren't the answers of this one
+            canceled_job.answers.all().delete()
+            serializer.save(status=JobStatuses.CREATED, created_at=timezone.now())
+        else:
+            self.perform_create(serializer)
+
+        return serializer
 
 
 class VerifyCanApplyToJobAPIView(APIView):
@@ -77,8 +200,8 @@ class VerifyCanApplyToJobAPIView(APIView):
         and whether the user has reached their daily application limits.
 
         Note:
-            This view applies the decorators `active_plan_requires` and `plan_limits_check_requires`
-            to ensure that the user has an active subscription and meets the job submission limits.
+            All rules are evaluated by `check_job_eligibility` with at most two queries, the error of the
+            first failed rule is returned with the list of all failed rules in "reasons".
         Args:
             APIView (class): Django Rest Framework's APIView class.
         Raises:
@@ -88,8 +211,6 @@ class VerifyCanApplyToJobAPIView(APIView):
         """
 
     @request_logger(logger=logging.getLogger('job_applying'))
-    @active_plan_requires
-    @plan_limits_check_requires
     def get(self, request, job_id: str, platform: JobSearchPlatforms):
         """
            Verifies if the user can apply for a job based on the provided parameters.
@@ -102,23 +223,41 @@ class VerifyCanApplyToJobAPIView(APIView):
                Returns status HTTP_200_OK if the user can apply, else raises exceptions.
 
         """
-        powered_by = request.query_params.get('powered_by')
-        company = request.query_params.get('company')
-        verify_user_can_apply_to_job(
+        check_job_eligibility(
             user=request.user,
             job_id=job_id,
             platform=platform,
-            powered_by=powered_by,
-            company=company
-        )
-
-        # check if user has created that job already , which remained in progress
-        if get_pending_job(user=request.user, job_id=job_id, platform=platform):
-            raise AlreadyExistsPendingJobException()
+            powered_by=request.query_params.get('powered_by'),
+            company=request.query_params.get('company')
+        ).raise_first()
 
         return Response(status=status.HTTP_200_OK)
 
 
+class BulkVerifyCanApplyToJobsAPIView(APIView):
+    @request_logger(logger=logging.getLogger('job_applying'))
+    def post(self, request, platform: JobSearchPlatforms):
+        """
+            Verifies a whole search results page at once, with the same rules as VerifyCanApplyToJobAPIView.
+            Request body: {"jobs": [{"job_id", "company", "powered_by"}, ...]}
+            Returns:
+                Response: [{"job_id", "eligible", "reasons": [{"code", "detail"}, ...]}, ...] in the request order.
+        """
+        serializer = BulkJobEligibilitySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        verdicts = check_jobs_eligibility(
+            user=request.user,
+            jobs=serializer.validated_data['jobs'],
+            platform=platform
+        )
+
+        return Response([
+            {"job_id": job['job_id'], "eligible": verdict.eligible, "reasons": verdict.as_list()}
+            for job, verdict in verdicts
+        ])
+
+
 class GetPendingJobAPIView(APIView):
     def get(self, request, job_id, platform):
         pending_order = get_pending_job(request.user, job_id, platform)
@@ -129,13 +268,19 @@ class GetPendingJobAPIView(APIView):
         return Response(serializer.data)
 
 
-class CreateAnswerAPIView(APIView):
+class CreateAnswerAPIView(CreateAPIView):
     serializer_class = AppliedJobQASerializer
 
     @request_logger(logger=logging.getLogger('job_applying'))
+    @idempotent
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
+    def perform_create(self, serializer):
+        if serializer.validated_data['job'].user_id != self.request.user.id:
+            raise NotFound()
+        serializer.save()
+
 
 class QAAPIView(RetrieveAPIView):
     queryset = AppliedJob.objects.all()
@@ -201,6 +346,10 @@ class DefaultResumeAsFileAPIView(APIView):
     def get(self, request, *args, **kwargs):
         """
             Handle GET request to download the user's selected resume.
+            Responses carry ETag/Last-Modified headers and a matching If-None-Match gets 304 without
+            touching storage. The ETag names the selected resume and its content, If-Modified-Since isn't
+            honored as switching to an older resume would look unmodified. With ?redirect=true the client is redirected
+            to a short-lived signed S3 url instead of the file being proxied through the app.
             Args:
                 request (HttpRequest): The HTTP request object.
                 *args: Variable-length argument list.
@@ -210,12 +359,49 @@ class DefaultResumeAsFileAPIView(APIView):
         """
         resume = request.user.selected_resume
 
-        if not resume or not resume.file.file:
+        if not resume or not resume.file:
             raise BaseValidationError("User doesn't have selected resume")
 
-        response = FileResponse(resume.file.file)
-        response['Content-Disposition'] = f'attachment; filename="{resume.file.name}"'
-        response['Access-Control-Expose-Headers'] = 'Content-Disposition'
+        last_modified = int(resume.updated_at.timestamp())
+        # older resumes have no content hash, their last update identifies the content
+        etag = quote_etag(f'{resume.id}-{resume.content_hash or last_modified}')
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None and request.query_params.get('redirect') == 'true':
+            url = get_resume_presigned_url(resume)
+            response = HttpResponseRedirect(url) if url else None
+        if response is None:
+            response = FileResponse(resume.file.open())
+            response['Content-Disposition'] = f'attachment; filename="{resume.file.name}"'
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
+        response['Access-Control-Expose-Headers'] = 'Content-Disposition, ETag, Last-Modified'
+
+        return response
+
+
+class QuotaStatusAPIView(APIView):
+    def get(self, request, *args, **kwargs):
+        """
+            Returns the job submissions quota of the user: {total, used, today_used, daily_limit, resets_at}.
+            The status is served from the cache and a matching If-None-Match gets 304,
+            so the extension can poll it cheaply.
+            Raises:
+                RequiresActiveSubscriptionException: If the user does not have an active subscription.
+        """
+        quota = get_quota_status(request.user)
+        if quota['payload'] is None:
+            raise RequiresActiveSubscriptionException()
+
+        response = get_conditional_response(request, etag=quota['etag'])
+        if response is None:
+            response = Response(quota['payload'])
+
+        response['ETag'] = quota['etag']
+        response['Cache-Control'] = 'private, no-cache'
+        response['Access-Control-Expose-Headers'] = 'ETag'
 
         return response
 
@@ -224,11 +410,41 @@ class UpdateAppliedJob(UpdateAPIView):
     serializer_class = AppliedJobSerializer
 
     def get_queryset(self):
-        return AppliedJob.objects.filter(user=self.request.user).all()
+        # locked, so parallel updates of the job see each other's status transition
+        return AppliedJob.objects.select_for_update().filter(user=self.request.user).all()
+
+    def perform_update(self, serializer):
+        status = serializer.validated_data.get('status', serializer.instance.status)
+        if not is_transition_allowed(serializer.instance.status, status):
+            raise BaseValidationError(f"Status transition from {serializer.instance.status} to {status} isn't allowed")
 
+        serializer.save()
+
+    @transaction.atomic
     def update(self, request, *args, **kwargs):
         res = super(UpdateAppliedJob, self).update(request, *args, **kwargs)
-        if request.user.active_subscription.possible_job_submissions <= 0:
-            set_subscription_expired(request.user.active_subscription)
+        subscription = get_subscription_snapshot(request.user, refresh=True)
+        if subscription and subscription.possible_job_submissions <= 0:
+            set_subscription_expired(subscription.subscription_id)
 
         return res
+
+
+class BulkUpdateAppliedJobsStatusAPIView(APIView):
+    @request_logger(logger=logging.getLogger('job_applying'))
+    def patch(self, request, *args, **kwargs):
+        """
+            Reports the outcomes of many jobs at once.
+            Request body: {"jobs": [{"id", "status"}, ...]}, jobs may leave the created status only.
+            Returns:
+                Response: {"jobs": [{"id", "status"}, ...], "quota": {total, used, today_used, daily_limit, resets_at}}
+        """
+        serializer = BulkJobStatusUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        jobs = apply_status_transitions(user=request.user, transitions=serializer.validated_data['jobs'])
+
+        return Response({
+            "jobs": [{"id": job.id, "status": job.status} for job in jobs],
+            "quota": get_quota_status(request.user)['payload'],
+        })
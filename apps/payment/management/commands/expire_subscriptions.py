@@ -0,0 +1,36 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.payment.models import Plan, PlanOption, Subscription
+from apps.payment.plan_limits import get_plan_limits
+from apps.payment.utils import expire_subscriptions
+
+
+class Command(BaseCommand):
+    help = "Deactivate subscriptions past their end date and ones that used all job submissions of the plan, " \
+           "should be scheduled (ex. cron) to run at least daily"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        expired = expire_subscriptions(
+            Subscription.objects.filter(end_date__lt=datetime.date.today()),
+            batch_size=batch_size
+        )
+        self.stdout.write(f'Expired subscriptions: {expired}')
+
+        exhausted = 0
+        for plan_id in Plan.objects.values_list('id', flat=True):
+            limit = get_plan_limits(plan_id).get(PlanOption.PlanOptionTypes.JOB_APPLICATIONS)
+            if limit is None:
+                continue
+
+            exhausted += expire_subscriptions(
+                Subscription.objects.filter(plan_id=plan_id, applied_jobs_count__gte=limit),
+                batch_size=batch_size
+            )
+        self.stdout.write(f'Exhausted subscriptions: {exhausted}')
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.payment.models import Subscription
+from apps.payment.utils import recalculate_subscription_usage
+
+
+class Command(BaseCommand):
+    help = "Recount the denormalized usage counters of subscriptions from their applied jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--active-only', action='store_true', help='Reconcile only active subscriptions')
+
+    def handle(self, *args, **options):
+        subscriptions = Subscription.objects.all()
+        if options['active_only']:
+            subscriptions = subscriptions.filter(active=True)
+
+        ids = list(subscriptions.order_by('id').values_list('id', flat=True))
+        batch_size = options['batch_size']
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            updated += recalculate_subscription_usage(
+                Subscription.objects.filter(id__in=ids[start:start + batch_size])
+            )
+
+        self.stdout.write(f'Reconciled subscriptions: {updated}')
@@ -3,6 +3,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from apps.payment.models import Plan
+from apps.payment.plan_limits import invalidate_plan_limits
 
 
 class Command(BaseCommand):
@@ -17,6 +18,9 @@ class Command(BaseCommand):
         for plan in stripe_plans['data']:
             Plan.objects.filter(name=plan['name']).update(stripe_price_id=plan['default_price'])
 
+        # queryset updates send no signals
+        invalidate_plan_limits()
+
         self.stdout.write('done.')
 
 
@@ -0,0 +1,21 @@
+from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.user.models import UserJobTitle
+
+
+class SubscriptionQuerySet(models.QuerySet):
+    def with_usage(self):
+        """
+            Annotates the usage numbers which are not stored on the subscription row, so
+            serializing a subscription makes no extra queries (job usage comes from the
+            counters on the row, plan limits from the plan limits cache).
+        """
+        job_titles = UserJobTitle.objects.filter(
+            user_id=OuterRef('user_id'), is_active=True
+        ).order_by().values('user_id').annotate(count=Count('id')).values('count')
+
+        return self.annotate(
+            used_job_titles_count=Coalesce(Subquery(job_titles, output_field=models.IntegerField()), 0)
+        )
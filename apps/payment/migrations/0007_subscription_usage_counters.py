@@ -0,0 +1,61 @@
+# Generated by Django 4.2.2 on 2026-10-19 12:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def backfill_usage_counters(apps, schema_editor):
+    """
+        Fills the usage counters from the applied jobs, batch by batch over subscription ids.
+    """
+    Subscription = apps.get_model('payment', 'Subscription')
+    AppliedJob = apps.get_model('job_applying', 'AppliedJob')
+
+    today = timezone.localdate()
+    applied_jobs = AppliedJob.objects.filter(
+        used_subscription_id=OuterRef('pk'), status='applied'
+    ).order_by().values('used_subscription_id')
+
+    def count(queryset):
+        return Coalesce(
+            Subquery(queryset.annotate(count=Count('id')).values('count'), output_field=IntegerField()), 0
+        )
+
+    ids = list(Subscription.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        Subscription.objects.filter(id__in=ids[start:start + BATCH_SIZE]).update(
+            applied_jobs_count=count(applied_jobs),
+            today_applied_jobs_count=count(applied_jobs.filter(created_at__date__gte=today)),
+            applied_jobs_day=today,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0006_alter_plan_image'),
+        ('job_applying', '0007_alter_appliedjobqa_answer_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='applied_jobs_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='applied_jobs_day',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='today_applied_jobs_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_usage_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.2 on 2026-10-19 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0007_subscription_usage_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['user', 'active'], name='subscriptions_user_active_idx'),
+        ),
+    ]
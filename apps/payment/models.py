@@ -1,11 +1,11 @@
-from datetime import datetime
-
 from django.core.files.storage import FileSystemStorage
 from django.db import models
+from django.utils import timezone
 
 # Create your models here.
 from apps.core.models import TimestampsModel
-from apps.job_applying.enums import JobStatuses
+from apps.payment.managers import SubscriptionQuerySet
+from apps.payment.plan_limits import get_plan_limit
 from apps.user.models import User
 
 
@@ -49,8 +49,7 @@ class Plan(models.Model):
 
     @property
     def job_applications_per_day(self):
-        option = self.options.filter(type=PlanOption.PlanOptionTypes.JOB_APPLICATIONS_PER_DAY).first()
-        return option.value if option else 0
+        return get_plan_limit(self.id, PlanOption.PlanOptionTypes.JOB_APPLICATIONS_PER_DAY)
 
 
 class PlanOption(models.Model):
@@ -82,15 +81,20 @@ class Subscription(TimestampsModel):
     active = models.BooleanField(default=True)
     stripe_webhook_id = models.CharField(max_length=50, null=True, blank=True)
     stripe_webhook_created_at = models.DateTimeField(auto_now_add=False, null=True)
+    # denormalized usage, maintained by apps.payment.utils.update_subscription_usage
+    applied_jobs_count = models.IntegerField(default=0)
+    today_applied_jobs_count = models.IntegerField(default=0)
+    applied_jobs_day = models.DateField(null=True, blank=True)
+
+    objects = SubscriptionQuerySet.as_manager()
 
     @property
     def used_jobs_submissions(self):
-        return self.applied_jobs.filter(status=JobStatuses.APPLIED).count()
+        return self.applied_jobs_count
 
     @property
     def total_job_submissions(self):
-        option = self.plan.options.filter(type=PlanOption.PlanOptionTypes.JOB_APPLICATIONS).first()
-        return option.value if option else 0
+        return get_plan_limit(self.plan_id, PlanOption.PlanOptionTypes.JOB_APPLICATIONS)
 
     @property
     def possible_job_submissions(self):
@@ -104,24 +108,26 @@ class Subscription(TimestampsModel):
 
     @property
     def total_job_titles(self):
-        option = self.plan.options.filter(type=PlanOption.PlanOptionTypes.JOB_TITLE).first()
-        return option.value if option else 0
+        return get_plan_limit(self.plan_id, PlanOption.PlanOptionTypes.JOB_TITLE)
 
     @property
     def used_job_titles(self):
+        # annotated by Subscription.objects.with_usage()
+        if hasattr(self, 'used_job_titles_count'):
+            return self.used_job_titles_count
+
         return self.user.job_titles.filter(is_active=True).count()
 
     @property
     def today_used_applications(self):
-        return self.applied_jobs.filter(
-            created_at__gte=datetime.now().date(),
-            status=JobStatuses.APPLIED,
-            used_subscription_id=self.id
-        ).count()
+        return self.today_applied_jobs_count if self.applied_jobs_day == timezone.localdate() else 0
 
     @property
     def daily_job_applications(self):
-        return self.plan.job_applications_per_day
+        return get_plan_limit(self.plan_id, PlanOption.PlanOptionTypes.JOB_APPLICATIONS_PER_DAY)
 
     class Meta:
         db_table = 'subscriptions'
+        indexes = [
+            models.Index(fields=['user', 'active'], name='subscriptions_user_active_idx'),
+        ]
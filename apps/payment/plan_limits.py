@@ -0,0 +1,88 @@
+import threading
+import uuid
+from typing import Dict
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.signals import request_started, request_finished
+from django.dispatch import receiver
+
+_VERSION_CACHE_KEY = 'plan_limits_version'
+
+# process-local {plan id: {option type: value}}, valid while its version matches the shared one
+_plan_limits: Dict[int, Dict[str, int]] = {}
+_loaded_version = None
+# the shared version read by the current request, so it's read from the cache once per request
+_request_state = threading.local()
+
+
+@receiver(request_started)
+def _request_started(**kwargs):
+    _request_state.in_request = True
+    _request_state.version = None
+
+
+@receiver(request_finished)
+def _request_finished(**kwargs):
+    _request_state.in_request = False
+    _request_state.version = None
+
+
+def _shared_version() -> str:
+    version = cache.get(_VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        # another worker may have set it in the meantime, keep the stored one
+        if not cache.add(_VERSION_CACHE_KEY, version, timeout=None):
+            version = cache.get(_VERSION_CACHE_KEY, version)
+
+    return version
+
+
+def load_plan_limits() -> Dict[int, Dict[str, int]]:
+    """
+        Reads the option limits of all plans in one query.
+    """
+    # resolved lazily, the models module reads its limits from here
+    PlanOption = apps.get_model('payment', 'PlanOption')
+    limits = {}
+    for plan_id, option_type, value in PlanOption.objects.order_by('id').values_list('plan_id', 'type', 'value'):
+        limits.setdefault(plan_id, {}).setdefault(option_type, value or 0)
+
+    return limits
+
+
+def get_plan_limits(plan_id: int) -> Dict[str, int]:
+    """
+        Returns {option type: value} of the plan. The whole plan catalog is loaded once
+        per process and reloaded only when the shared version changes (see invalidate_plan_limits),
+        which is checked once per request (on every lookup outside of requests).
+    """
+    global _plan_limits, _loaded_version
+
+    version = getattr(_request_state, 'version', None)
+    if version is None:
+        version = _shared_version()
+        if getattr(_request_state, 'in_request', False):
+            _request_state.version = version
+
+    if version != _loaded_version:
+        _plan_limits = load_plan_limits()
+        _loaded_version = version
+
+    return _plan_limits.get(plan_id, {})
+
+
+def get_plan_limit(plan_id: int, option_type: str) -> int:
+    return get_plan_limits(plan_id).get(option_type, 0)
+
+
+def invalidate_plan_limits():
+    """
+        Bumps the shared version, every process reloads the limits on its next lookup.
+    """
+    global _loaded_version
+
+    cache.set(_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    _loaded_version = None
+    _request_state.version = None
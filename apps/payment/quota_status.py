@@ -0,0 +1,72 @@
+import datetime
+import hashlib
+import json
+from typing import Iterable, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.payment.snapshots import load_subscription_snapshot
+from apps.user.models import User
+
+
+def _cache_key(user_id: int) -> str:
+    return f'quota_status_{user_id}'
+
+
+def next_quota_reset() -> datetime.datetime:
+    """
+        Daily limits are counted per local day, they reset at the next midnight.
+    """
+    return timezone.make_aware(
+        datetime.datetime.combine(timezone.localdate() + datetime.timedelta(days=1), datetime.time.min)
+    )
+
+
+def build_quota_status(user: User) -> dict:
+    """
+        Returns {"payload": quota dict or None without active subscription, "etag": str}
+    """
+    snapshot = load_subscription_snapshot(user)
+    payload = snapshot and {
+        "total": snapshot.total_job_submissions,
+        "used": snapshot.used_job_submissions,
+        "today_used": snapshot.today_used_applications,
+        "daily_limit": snapshot.daily_job_applications,
+        "resets_at": next_quota_reset().isoformat(),
+    }
+    etag = hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    return {"payload": payload, "etag": f'"{etag}"'}
+
+
+def get_quota_status(user: User) -> dict:
+    """
+        Returns the quota status of the user from the cache, it is built and cached on a miss.
+        Entries are deleted when usage or subscriptions change (see invalidate_quota_status)
+        and never outlive the daily reset.
+    """
+    status = cache.get(_cache_key(user.id))
+    if status is None:
+        status = build_quota_status(user)
+        timeout = min(
+            settings.QUOTA_STATUS_CACHE_TIMEOUT,
+            int((next_quota_reset() - timezone.now()).total_seconds()) + 1
+        )
+        cache.set(_cache_key(user.id), status, timeout=timeout)
+
+    return status
+
+
+def invalidate_quota_status(user_ids: Union[int, Iterable[int]]):
+    """
+        Deletes the cached statuses once the current transaction commits (right away outside of one),
+        a status built before the commit would cache the old usage again.
+    """
+    if isinstance(user_ids, int):
+        user_ids = [user_ids]
+    keys = [_cache_key(user_id) for user_id in set(user_ids)]
+
+    transaction.on_commit(lambda: cache.delete_many(keys))
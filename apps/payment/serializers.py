@@ -30,6 +30,10 @@ class PlanSerializer(serializers.ModelSerializer):
 
 
 class SubscriptionSerializer(serializers.ModelSerializer):
+    """
+        Reads usage from the subscription counters, the plan limits cache and the
+        Subscription.objects.with_usage() annotations, pass subscriptions loaded with it.
+    """
     job_submissions = serializers.SerializerMethodField()
     job_titles = serializers.SerializerMethodField()
     today_applications = serializers.SerializerMethodField()
@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.payment.models import Plan, PlanOption, Subscription
+from apps.payment.plan_limits import invalidate_plan_limits
+from apps.payment.quota_status import invalidate_quota_status
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+@receiver(post_save, sender=PlanOption)
+@receiver(post_delete, sender=PlanOption)
+def plan_changed(sender, **kwargs):
+    # after commit, a reload before it would read the old rows and be taken for the new version
+    transaction.on_commit(invalidate_plan_limits)
+
+
+@receiver(post_save, sender=Subscription)
+def subscription_changed(sender, instance, **kwargs):
+    invalidate_quota_status(instance.user_id)
@@ -0,0 +1,72 @@
+import datetime
+from dataclasses import dataclass
+from typing import Union
+
+from apps.payment.models import PlanOption
+from apps.payment.plan_limits import get_plan_limits
+from apps.user.models import User
+
+_SNAPSHOT_ATTR = '_subscription_snapshot'
+
+
+@dataclass(frozen=True)
+class SubscriptionSnapshot:
+    """
+        Immutable view of the user's active subscription: plan limits and usage counts.
+        It is loaded once per request (see get_subscription_snapshot) and shared by the
+        plan decorators, validators, views and serializers instead of re-querying the subscription.
+    """
+    subscription_id: int
+    plan_id: int
+    end_date: Union[datetime.date, None]
+    total_job_submissions: int
+    used_job_submissions: int
+    daily_job_applications: int
+    today_used_applications: int
+    total_job_titles: int
+
+    @property
+    def possible_job_submissions(self) -> int:
+        val = self.total_job_submissions - self.used_job_submissions
+        return val if val > 0 else 0
+
+    @property
+    def possible_today_applications(self) -> int:
+        val = self.daily_job_applications - self.today_used_applications
+        return val if val > 0 else 0
+
+
+def load_subscription_snapshot(user: User) -> Union[SubscriptionSnapshot, None]:
+    """
+        Loads the active subscription with its usage counters (one query),
+        plan limits come from the process-local plan limits cache.
+    """
+    subscription = user.active_subscriptions.order_by('id').first()
+
+    if not subscription:
+        return None
+
+    options = get_plan_limits(subscription.plan_id)
+
+    return SubscriptionSnapshot(
+        subscription_id=subscription.id,
+        plan_id=subscription.plan_id,
+        end_date=subscription.end_date,
+        total_job_submissions=options.get(PlanOption.PlanOptionTypes.JOB_APPLICATIONS, 0),
+        used_job_submissions=subscription.used_jobs_submissions,
+        daily_job_applications=options.get(PlanOption.PlanOptionTypes.JOB_APPLICATIONS_PER_DAY, 0),
+        today_used_applications=subscription.today_used_applications,
+        total_job_titles=options.get(PlanOption.PlanOptionTypes.JOB_TITLE, 0),
+    )
+
+
+def get_subscription_snapshot(user: User, refresh: bool = False) -> Union[SubscriptionSnapshot, None]:
+    """
+        Returns the snapshot memoized on the user instance. The authenticated user is loaded
+        for every request, so the snapshot lives exactly as long as the request.
+        Pass refresh=True after changing the subscription or its usage.
+    """
+    if refresh or not hasattr(user, _SNAPSHOT_ATTR):
+        setattr(user, _SNAPSHOT_ATTR, load_subscription_snapshot(user))
+
+    return getattr(user, _SNAPSHOT_ATTR)
@@ -1,6 +1,14 @@
 import datetime
 
+from django.db.models import F, Case, When, Value, Count, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.job_applying.enums import JobStatuses
+from apps.job_applying.models import AppliedJob, ArchivedAppliedJob
 from apps.payment.models import Plan, Subscription
+from apps.payment.quota_status import invalidate_quota_status
+from apps.payment.snapshots import get_subscription_snapshot
 from apps.setup.enums import FieldSlugs
 from apps.user.models import User
 
@@ -29,6 +37,7 @@ def user_subscribes_to_plan(user: User, plan: Plan) -> None:
 
 def deactivate_user_subscriptions(user: User) -> None:
     Subscription.objects.filter(user=user).update(active=False)
+    invalidate_quota_status(user.id)
 
 
 def user_subscribes_to_free_plan(user: User):
@@ -36,9 +45,87 @@ def user_subscribes_to_free_plan(user: User):
     user_subscribes_to_plan(user=user, plan=plan)
 
 
-def set_subscription_expired(subscription: Subscription):
-    subscription.active = False
-    subscription.save()
+def set_subscription_expired(subscription_id: int):
+    subscriptions = Subscription.objects.filter(pk=subscription_id)
+    subscriptions.update(active=False, updated_at=timezone.now())
+    invalidate_quota_status(subscriptions.values_list('user_id', flat=True))
+
+
+def expire_subscriptions(subscriptions, batch_size: int = 1000) -> int:
+    """
+        Deactivates the given active subscriptions batch by batch.
+        Parameters:
+        - subscriptions: Subscription queryset
+        - batch_size: number of subscriptions updated by one query
+        Returns the number of deactivated subscriptions
+    """
+    expired = 0
+    while True:
+        rows = list(subscriptions.filter(active=True).order_by('id').values_list('id', 'user_id')[:batch_size])
+        if not rows:
+            return expired
+
+        ids, user_ids = zip(*rows)
+        expired += Subscription.objects.filter(id__in=ids, active=True).update(
+            active=False, updated_at=timezone.now()
+        )
+        invalidate_quota_status(user_ids)
+
+
+def update_subscription_usage(subscription_id: int, applied_delta: int, today_delta: int = 0):
+    """
+        Atomically moves the denormalized usage counters of a subscription.
+        The today counter belongs to the day stored in applied_jobs_day,
+        the first change of a new day starts it from zero.
+        Parameters:
+        - subscription_id: id of the subscription the jobs were applied with
+        - applied_delta: change of the total applied jobs count
+        - today_delta: change of the applied jobs count of jobs created today
+    """
+    if not applied_delta and not today_delta:
+        return
+
+    today = timezone.localdate()
+    Subscription.objects.filter(pk=subscription_id).update(
+        applied_jobs_count=F('applied_jobs_count') + applied_delta,
+        today_applied_jobs_count=Case(
+            When(applied_jobs_day=today, then=F('today_applied_jobs_count') + today_delta),
+            default=Value(max(today_delta, 0)),
+        ),
+        applied_jobs_day=today,
+    )
+
+
+def recalculate_subscription_usage(subscriptions) -> int:
+    """
+        Recounts the usage counters of the given subscriptions from their applied jobs, archived ones included.
+        Parameters:
+        - subscriptions: Subscription queryset
+        Returns the number of updated subscriptions
+    """
+    today = timezone.localdate()
+    applied_jobs = AppliedJob.objects.filter(
+        used_subscription_id=OuterRef('pk'), status=JobStatuses.APPLIED
+    ).order_by().values('used_subscription_id')
+
+    def count(queryset):
+        return Coalesce(
+            Subquery(queryset.annotate(count=Count('id')).values('count'), output_field=IntegerField()), 0
+        )
+
+    # archived jobs are never created today, they count in the total only
+    archived_applied_jobs = ArchivedAppliedJob.objects.filter(
+        used_subscription_id=OuterRef('pk'), status=JobStatuses.APPLIED
+    ).order_by().values('used_subscription_id')
+
+    updated = subscriptions.update(
+        applied_jobs_count=count(applied_jobs) + count(archived_applied_jobs),
+        today_applied_jobs_count=count(applied_jobs.filter(created_at__date__gte=today)),
+        applied_jobs_day=today,
+    )
+    invalidate_quota_status(subscriptions.values_list('user_id', flat=True))
+
+    return updated
 
 
 def sync_user_data_with_plan_limits(user: User):
@@ -53,7 +140,7 @@ def sync_user_data_with_plan_limits(user: User):
     if not job_titles:
         return
 
-    plan_limit = user.active_subscription.total_job_titles
+    plan_limit = get_subscription_snapshot(user, refresh=True).total_job_titles
     job_titles.values = job_titles.values[:plan_limit] if job_titles.values else []
     job_titles.save()
 
@@ -1,7 +1,7 @@
 from django.core.management.base import BaseCommand
 
 from apps.user.models import UserResume
-from apps.user.services import ResumeParserService
+from apps.user.services import ResumeIngestionService
 
 
 class Command(BaseCommand):
@@ -12,7 +12,8 @@ class Command(BaseCommand):
         for r in UserResume.objects.all():
             self.stdout.write(f'Parsing resume: {r.file.name} ...')
             try:
-                ResumeParserService(r).save_parsed_data()
+                with ResumeIngestionService.from_storage(r.file.name) as ingestion:
+                    ingestion.refresh_resume(r)
             except FileNotFoundError:
                 self.stdout.write(f'File not found: {r.file.name}')
         self.stdout.write('done.')
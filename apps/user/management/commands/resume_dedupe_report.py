@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, Avg, Q
+
+from apps.user.models import UserResume
+
+
+class Command(BaseCommand):
+    help = "Report storage, parser runs and parse time saved by reusing resumes with the same content"
+
+    def handle(self, *args, **options):
+        # resumes are only reused within the resumes of one user
+        contents = UserResume.objects.filter(content_hash__isnull=False).values('user', 'content_hash').annotate(
+            copies=Count('id'),
+            stored_files=Count('file', distinct=True),
+            size=Max('file_size'),
+            parser_runs=Count('parsed_data', distinct=True, filter=Q(parsed_data__parse_duration__isnull=False)),
+            parse_duration=Avg('parsed_data__parse_duration'),
+        ).filter(copies__gt=1)
+
+        reused, saved_bytes, avoided_runs, saved_seconds = 0, 0, 0, 0
+        for content in contents.iterator():
+            reused += content['copies'] - content['stored_files']
+            saved_bytes += (content['copies'] - content['stored_files']) * (content['size'] or 0)
+            # resumes parsed before the durations were recorded can't be accounted
+            if content['parser_runs']:
+                avoided_runs += content['copies'] - content['parser_runs']
+                saved_seconds += (content['copies'] - content['parser_runs']) * content['parse_duration']
+
+        self.stdout.write(f'Reused resumes: {reused}')
+        self.stdout.write(f'Storage saved: {saved_bytes} bytes')
+        self.stdout.write(f'Parser runs avoided: {avoided_runs}')
+        self.stdout.write(f'Parse time saved: {saved_seconds:.2f}s')
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.2 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0007_userresumeparsed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userresume',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='userresume',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userresume',
+            name='text',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
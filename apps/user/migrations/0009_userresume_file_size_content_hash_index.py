@@ -0,0 +1,22 @@
+# Generated by Django 4.2.2 on 2026-10-19 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0008_userresume_content_hash_page_count_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userresume',
+            name='file_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userresume',
+            index=models.Index(fields=['content_hash'], name='user_resumes_content_hash_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.2 on 2026-10-19 12:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0009_userresume_file_size_content_hash_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserResumeParsedData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now_add=True, verbose_name='Last Update')),
+                ('data', models.JSONField(null=True)),
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='parsed_data', to='user.userresume')),
+            ],
+            options={
+                'db_table': 'user_resume_parsed_data',
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.2 on 2026-10-19 12:05
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def split_parsed_data(apps, schema_editor):
+    """
+        Moves every {file name: parsed data} entry of the per-user blobs
+        into a row of the resume with that file, entries of deleted resumes are dropped.
+    """
+    UserResume = apps.get_model('user', 'UserResume')
+    UserResumeParsed = apps.get_model('user', 'UserResumeParsed')
+    UserResumeParsedData = apps.get_model('user', 'UserResumeParsedData')
+
+    rows = []
+    for blob in UserResumeParsed.objects.exclude(data=None).iterator(chunk_size=BATCH_SIZE):
+        for resume in UserResume.objects.filter(user_id=blob.user_id, file__in=list(blob.data.keys())):
+            rows.append(UserResumeParsedData(resume=resume, data=blob.data[resume.file.name]))
+
+        if len(rows) >= BATCH_SIZE:
+            UserResumeParsedData.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+
+    UserResumeParsedData.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    # every batch is committed on its own and rows of resumes already split are skipped,
+    # so the split can be re-run after an interruption
+    atomic = False
+
+    dependencies = [
+        ('user', '0010_userresumeparseddata'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_parsed_data, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.2 on 2026-10-19 12:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0011_split_userresumeparsed'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='UserResumeParsed',
+        ),
+    ]
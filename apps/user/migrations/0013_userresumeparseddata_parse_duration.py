@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-19 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0012_delete_userresumeparsed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userresumeparseddata',
+            name='parse_duration',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.2 on 2026-10-19 13:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0013_userresumeparseddata_parse_duration'),
+    ]
+
+    operations = [
+        # frees the parsed_data name, the resume link is removed once the resumes are linked (0016)
+        migrations.AlterField(
+            model_name='userresumeparseddata',
+            name='resume',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='user.userresume'),
+        ),
+        migrations.AddField(
+            model_name='userresume',
+            name='parsed_data',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumes', to='user.userresumeparseddata'),
+        ),
+    ]
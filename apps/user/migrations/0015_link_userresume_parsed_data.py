@@ -0,0 +1,41 @@
+# Generated by Django 4.2.2 on 2026-10-19 13:40
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def link_parsed_data(apps, schema_editor):
+    """
+        Points every resume to the parsed data row created for it, resumes already linked are skipped,
+        so it can be re-run.
+    """
+    UserResume = apps.get_model('user', 'UserResume')
+    UserResumeParsedData = apps.get_model('user', 'UserResumeParsedData')
+
+    UserResume.objects.filter(parsed_data__isnull=True).update(parsed_data=Subquery(
+        UserResumeParsedData.objects.filter(resume_id=OuterRef('pk')).values('id')[:1]
+    ))
+
+
+def unlink_parsed_data(apps, schema_editor):
+    """
+        Gives every parsed data row back one of its resumes, the rows of no resume are deleted.
+    """
+    UserResume = apps.get_model('user', 'UserResume')
+    UserResumeParsedData = apps.get_model('user', 'UserResumeParsedData')
+
+    UserResumeParsedData.objects.filter(resume__isnull=True).update(resume=Subquery(
+        UserResume.objects.filter(parsed_data_id=OuterRef('pk')).order_by('id').values('id')[:1]
+    ))
+    UserResumeParsedData.objects.filter(resume__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0014_userresume_parsed_data'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_parsed_data, unlink_parsed_data),
+    ]
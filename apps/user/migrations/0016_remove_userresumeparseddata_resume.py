@@ -0,0 +1,17 @@
+# Generated by Django 4.2.2 on 2026-10-19 13:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0015_link_userresume_parsed_data'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userresumeparseddata',
+            name='resume',
+        ),
+    ]
@@ -43,10 +43,16 @@ class User(AbstractUser, TimestampsModel):
         db_table = 'auth_user'
 
     @property
-    def active_subscription(self):
+    def active_subscriptions(self):
+        # paid subscriptions have no end date, expired and exhausted ones are
+        # deactivated by the expire_subscriptions command
         return self.subscriptions.filter(active=True).filter(
-            Q(plan__amount__gt=0) | Q(end_date__gte=datetime.datetime.now().date())
-        ).first()
+            Q(end_date__isnull=True) | Q(end_date__gte=datetime.datetime.now().date())
+        )
+
+    @property
+    def active_subscription(self):
+        return self.active_subscriptions.with_usage().first()
 
     @property
     def has_used_free_subscription(self):
@@ -54,7 +60,7 @@ class User(AbstractUser, TimestampsModel):
 
     @property
     def last_used_subscription(self):
-        return self.subscriptions.order_by('-created_at').filter(
+        return self.subscriptions.with_usage().order_by('-created_at').filter(
             Q(stripe_webhook_id__isnull=True, plan__amount=0) |
             Q(stripe_webhook_id__isnull=False)
         ).first()
@@ -84,9 +90,20 @@ class UserResume(TimestampsModel):
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'docx'])]
     )
     display_name = models.CharField(max_length=155)
+    content_hash = models.CharField(max_length=64, null=True, blank=True)
+    file_size = models.PositiveIntegerField(null=True, blank=True)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    text = models.TextField(null=True, blank=True)
+    # shared by the user's resumes with the same content
+    parsed_data = models.ForeignKey(
+        'UserResumeParsedData', on_delete=models.SET_NULL, null=True, blank=True, related_name='resumes'
+    )
 
     class Meta:
         db_table = 'user_resumes'
+        indexes = [
+            models.Index(fields=['content_hash'], name='user_resumes_content_hash_idx'),
+        ]
 
     @property
     def extension(self):
@@ -134,13 +151,23 @@ class UserJobSearchFilter(TimestampsModel):
     class Meta:
         db_table = 'user_job_search_filters'
 
-class UserResumeParsed(TimestampsModel):
-    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='user_resume_parsed')
+class UserResumeParsedData(TimestampsModel):
     data = models.JSONField(null=True)
+    # in seconds
+    parse_duration = models.FloatField(null=True, blank=True)
 
     class Meta:
-        db_table = 'user_resume_parsed'
+        db_table = 'user_resume_parsed_data'
 
 @receiver(models.signals.post_delete, sender=UserResume)
 def remove_file_from_s3(sender, instance, using, **kwargs):
-    instance.file.delete(save=False)
+    # resumes with the same content share one storage object
+    if not UserResume.objects.filter(file=instance.file.name).exists():
+        instance.file.delete(save=False)
+
+
+@receiver(models.signals.post_delete, sender=UserResume)
+def remove_unused_parsed_data(sender, instance, using, **kwargs):
+    # and one parsed data row
+    if instance.parsed_data_id and not UserResume.objects.filter(parsed_data_id=instance.parsed_data_id).exists():
+        UserResumeParsedData.objects.filter(pk=instance.parsed_data_id).delete()
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import update_last_login
@@ -11,13 +12,15 @@ from rest_framework_simplejwt.serializers import TokenObtainSerializer
 
 from apps.core.exceptions import BaseValidationError, InActiveUser
 from apps.core.serializers import Base64StringField
+from apps.job_applying.services.company_matcher import invalidate_company_matcher
 from apps.payment.serializers import SubscriptionSerializer
+from apps.payment.snapshots import get_subscription_snapshot
 from apps.setup.enums import FieldType, FieldSlugs
 from apps.setup.models import AdditionalQuestion, Field
 from apps.setup.serializers import AdditionalQuestionSerializer
 from apps.user.mixins import ValidatePasswordsMatchMixin, ValidatePasswordRulesMixin, ValidateCodeMixin
 from apps.user.models import User, UserJobTitle, UserSkill, UserAdditionalQuestion, UserResume, UserJobSearchFilter
-from apps.user.services import VectoriseUserInfo
+from apps.user.services import VectoriseUserInfo, ResumeIngestionService
 from apps.user.utils import delete_all_verification_codes_for_user, verify_code
 
 
@@ -168,13 +171,31 @@ class UserResumesSerializer(serializers.ModelSerializer):
     file = Base64StringField(
         required=True,
         allow_null=False,
-        max_size=2000,
+        max_size=settings.RESUME_MAX_SIZE,
         allowed_extensions=['pdf', 'docx']
     )
 
     class Meta:
         model = UserResume
-        exclude = ('user',)
+        exclude = ('user', 'text')
+        read_only_fields = ('content_hash', 'file_size', 'page_count')
+
+
+class UploadResumeSerializer(serializers.ModelSerializer):
+    """
+        Resume sent as a multipart file, it is streamed to a temporary file by the upload handlers
+        and then ingested from there, so it is never held in memory as a whole.
+    """
+    file = serializers.FileField(required=True, allow_empty_file=False)
+
+    def create(self, validated_data):
+        with ResumeIngestionService(validated_data['file']) as ingestion:
+            return ingestion.create_resume(user=validated_data['user'], display_name=validated_data['display_name'])
+
+    class Meta:
+        model = UserResume
+        exclude = ('user', 'text')
+        read_only_fields = ('content_hash', 'file_size', 'page_count')
 
 
 class UserSetupJobSettingsSerializer(serializers.ModelSerializer):
@@ -185,7 +206,8 @@ class UserSetupJobSettingsSerializer(serializers.ModelSerializer):
     is_update = serializers.BooleanField(default=False)
 
     def validate_resumes(self, value):
-        if not self.initial_data.get('is_update') and len(value) == 0:
+        # resumes can be uploaded beforehand with multipart requests
+        if not self.initial_data.get('is_update') and len(value) == 0 and not self.instance.resumes.exists():
             raise ValidationError("Upload at least 1 resume")
 
         return value
@@ -220,9 +242,11 @@ class UserSetupJobSettingsSerializer(serializers.ModelSerializer):
                 values=i.get('values')
             ) for i in validated_data['additional_questions']
         )
-        if len(validated_data.get('resumes', [])) > 0:
-            for f in validated_data['resumes']:
-                UserResume(user=self.instance, file=f['file'], display_name=f['display_name']).save()
+        for f in validated_data.get('resumes', []):
+            ingestion = ResumeIngestionService.from_storage(f['file']) if isinstance(f['file'], str) \
+                else ResumeIngestionService(f['file'])
+            with ingestion:
+                ingestion.create_resume(user=self.instance, display_name=f['display_name'])
 
         try:
             if not self.instance.selected_resume and len(self.instance.resumes.all()):
@@ -300,8 +324,8 @@ class UserSetupJobSearchFiltersSerializer(serializers.ModelSerializer):
         job_title_filter = next(
             item for item in attrs['job_search_filters'] if item["job_search_filter"].slug == FieldSlugs.JOB_TITLE
         )
-        if not self.instance.active_subscription or len(
-                job_title_filter['values']) > self.instance.active_subscription.total_job_titles:
+        subscription = get_subscription_snapshot(self.instance)
+        if not subscription or len(job_title_filter['values']) > subscription.total_job_titles:
             raise BaseValidationError({"job_titles": "Your plan doesn't allow add more job titles"})
 
         return attrs
@@ -317,6 +341,8 @@ class UserSetupJobSearchFiltersSerializer(serializers.ModelSerializer):
                 values=i.get('values')
             ) for i in validated_data['job_search_filters']
         )
+        user_id = self.instance.id
+        transaction.on_commit(lambda: invalidate_company_matcher(user_id))
 
     class Meta:
         model = User
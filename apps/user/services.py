@@ -1,17 +1,28 @@
 import base64
+import hashlib
+import io
 import json
+import logging
 import os
+import time
+import uuid
+from typing import Union, Tuple
 
+import filetype
 import requests
 from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import TemporaryUploadedFile
 from pydparser import ResumeParser
 from langchain.text_splitter import CharacterTextSplitter
 from rest_framework_simplejwt.exceptions import AuthenticationFailed
-from apps.job_applying.services.info_collector import UserInfoCollector
+from apps.core.exceptions import BaseValidationError
+from apps.job_applying.services.info_collector import UserInfoCollector, ResumeReader
 from apps.user.enums import SignupTypes
 from langchain_community.embeddings import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
-from apps.user.models import User, UserResume, UserResumeParsed
+from apps.user.models import User, UserResume, UserResumeParsedData
 
 
 class GoogleLoginService:
@@ -64,36 +75,192 @@ class GoogleLoginService:
 class ResumeParserService:
     def __init__(self, resume: UserResume):
         self.resume = resume
-        self.temp_file_path = os.path.join(settings.BASE_DIR, 'uploads', self.resume.file.name)
 
-    def get_parsed_data(self, file_path: str):
-        return ResumeParser(file_path).get_extracted_data()
+    def get_parsed_data(self, source: Union[str, io.BytesIO]):
+        return ResumeParser(source).get_extracted_data()
 
-    def save_parsed_data(self):
-        self.save_file_to_local()
-        if not os.path.exists(self.temp_file_path):
-            raise FileNotFoundError(f"File not found at {self.temp_file_path}")
+    def save_parsed_data(self, source: Union[str, io.BytesIO]):
+        started_at = time.monotonic()
+        data = self.get_parsed_data(source)
+        parse_duration = time.monotonic() - started_at
+        logging.getLogger('common').info(f'Resume {self.resume.id} parsed in {parse_duration:.2f}s')
+        self.store(data, parse_duration)
 
-        data = self.get_parsed_data(self.temp_file_path)
+    def use_parsed_data(self, resume: UserResume) -> bool:
+        """
+            Shares the parsed data of a resume with the same content, returns False if it wasn't parsed.
+        """
+        if resume.parsed_data_id is None:
+            return False
+
+        self.link(resume.parsed_data_id)
+        return True
+
+    def store(self, data: dict, parse_duration: float = None):
+        # a new row, the previous one may be shared by the resumes with the previous content
+        self.link(UserResumeParsedData.objects.create(data=data, parse_duration=parse_duration).id)
+
+    def link(self, parsed_data_id: int):
+        previous_id, self.resume.parsed_data_id = self.resume.parsed_data_id, parsed_data_id
+        self.resume.save(update_fields=['parsed_data', 'updated_at'])
+        if previous_id and not UserResume.objects.filter(parsed_data_id=previous_id).exists():
+            UserResumeParsedData.objects.filter(pk=previous_id).delete()
+
+
+class ResumeIngestionService:
+    """
+        Reads a resume once and derives everything we keep about it from that single pass:
+        content hash, type, page count and extracted text.
+        The same buffer is written to storage and handed to the resume parser, so the file
+        is never downloaded back from storage. When the user already has a resume with the same content hash,
+        its storage object and parsed data are shared and its text is copied instead.
+        Use it as a context manager, the file is read and validated on enter and the buffer
+        (and the temporary file behind it, if any) is released on exit, also when enter fails.
+    """
+    allowed_extensions = ('.pdf', '.docx')
+
+    def __init__(self, file: File = None, stored_name: str = None):
+        self.file = file
+        self.stored_name = stored_name
+        self.extension = None
+        self.content_hash, self.size = None, None
+        self.text = None
+        self.page_count = None
+
+    @classmethod
+    def from_storage(cls, name: str) -> 'ResumeIngestionService':
+        """
+            Ingest a file which is already in storage, it's downloaded once into a temporary file on enter.
+        """
+        return cls(stored_name=name)
+
+    def download(self) -> TemporaryUploadedFile:
+        if not default_storage.exists(self.stored_name):
+            raise FileNotFoundError(f"File not found: {self.stored_name}")
+
+        upload = TemporaryUploadedFile(os.path.basename(self.stored_name), None, 0, None)
         try:
-            user_data = self.resume.user.user_resume_parsed
-        except UserResumeParsed.DoesNotExist:
-            user_data =  UserResumeParsed(user=self.resume.user, data={})
+            with default_storage.open(self.stored_name) as f:
+                for chunk in f.chunks():
+                    upload.write(chunk)
+        except Exception:
+            upload.close()
+            raise
+
+        return upload
+
+    def get_extension(self) -> str:
+        guessed = filetype.guess_extension(self.file)
+        extension = f'.{guessed}' if guessed else os.path.splitext(self.file.name or '')[1].lower()
+        if extension not in self.allowed_extensions:
+            raise BaseValidationError(f"Allowed Extensions are {[e[1:] for e in self.allowed_extensions]}")
+
+        return extension
+
+    def hash_content(self) -> Tuple[str, int]:
+        content_hash, size = hashlib.sha256(), 0
+        for chunk in self.file.chunks():
+            content_hash.update(chunk)
+            size += len(chunk)
+
+        return content_hash.hexdigest(), size
+
+    def extract_text(self):
+        reader = ResumeReader(self.file, self.extension)
+        self.text = reader.read()
+        self.page_count = reader.page_count
+
+    def find_duplicate(self, user: User) -> Union[UserResume, None]:
+        # only the user's own resumes, a resume is never shared with another user
+        return UserResume.objects.filter(
+            user=user,
+            content_hash=self.content_hash,
+            text__isnull=False
+        ).order_by('id').first()
+
+    @property
+    def parser_source(self) -> Union[str, io.BytesIO]:
+        """
+            pydparser accepts either a path or a BytesIO,
+            give it the temporary file or the in memory buffer we already hold.
+        """
+        if hasattr(self.file, 'temporary_file_path'):
+            return self.file.temporary_file_path()
+
+        buffer = getattr(self.file, 'file', None)
+        if not isinstance(buffer, io.BytesIO):
+            self.file.seek(0)
+            buffer = io.BytesIO(self.file.read())
+        buffer.seek(0)
+        buffer.name = f'resume{self.extension}'
 
-        user_data.data.update({self.resume.file.name: data})
-        user_data.save()
+        return buffer
 
-    def save_file_to_local(self):
+    def create_resume(self, user: User, display_name: str) -> UserResume:
+        duplicate = self.find_duplicate(user)
+        if duplicate:
+            self.text, self.page_count = duplicate.text, duplicate.page_count
+        else:
+            self.extract_text()
+
+        resume = UserResume(
+            user=user,
+            display_name=display_name,
+            content_hash=self.content_hash,
+            file_size=self.size,
+            page_count=self.page_count,
+            text=self.text
+        )
+        if duplicate:
+            resume.file = duplicate.file.name
+        elif self.stored_name:
+            resume.file = self.stored_name
+        else:
+            self.file.seek(0)
+            resume.file.save(f'{uuid.uuid4()}{self.extension}', self.file, save=False)
+        resume.save()
+
+        parser = ResumeParserService(resume)
+        if duplicate and parser.use_parsed_data(duplicate):
+            logging.getLogger('common').info(
+                f'Resume {resume.id} reuses resume {duplicate.id}, skipped upload and parsing of {self.size} bytes'
+            )
+        else:
+            parser.save_parsed_data(self.parser_source)
+
+        return resume
+
+    def refresh_resume(self, resume: UserResume) -> UserResume:
+        self.extract_text()
+        resume.content_hash = self.content_hash
+        resume.file_size = self.size
+        resume.page_count = self.page_count
+        resume.text = self.text
+        resume.save(update_fields=['content_hash', 'file_size', 'page_count', 'text', 'updated_at'])
+
+        ResumeParserService(resume).save_parsed_data(self.parser_source)
+
+        return resume
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    def __enter__(self):
         try:
-            file = self.resume.file.file
-        except FileNotFoundError:
-            return
+            if self.file is None:
+                self.file = self.download()
+            self.extension = self.get_extension()
+            self.content_hash, self.size = self.hash_content()
+        except Exception:
+            self.close()
+            raise
+
+        return self
 
-        with open(self.temp_file_path, 'wb') as f:
-            f.write(file.read())
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
-    def __del__(self):
-        self.temp_file_path and os.remove(self.temp_file_path)
 
 class VectoriseUserInfo:
     folder_path = os.path.join(settings.BASE_DIR, 'uploads', 'vectorStore', 'faiss')
@@ -104,6 +271,11 @@ class VectoriseUserInfo:
 
     def save_local(self):
         user_info = UserInfoCollector(self.user).execute()
+        info_hash = hashlib.sha256(user_info.encode()).hexdigest()
+        if self.get_saved_hash() == info_hash:
+            # same resume text and answers, embeddings are still valid
+            return
+
         texts = CharacterTextSplitter(
             separator="\n",
             chunk_size=1000,
@@ -112,6 +284,21 @@ class VectoriseUserInfo:
         ).split_text(user_info)
         db = FAISS.from_texts(texts, self.embedder)
         db.save_local(self.folder_path, f'user_{self.user.id}')
+        with open(self.hash_path, 'w') as f:
+            f.write(info_hash)
+
+    @property
+    def hash_path(self) -> str:
+        return os.path.join(self.folder_path, f'user_{self.user.id}.sha256')
+
+    def get_saved_hash(self) -> Union[str, None]:
+        if not os.path.exists(os.path.join(self.folder_path, f'user_{self.user.id}.faiss')):
+            return None
+        try:
+            with open(self.hash_path) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
 
     def load_local(self):
         try:
@@ -1,13 +1,9 @@
-import logging
-
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from pydparser import ResumeParser
 
 from apps.payment.stripe.services import CustomerService
 from apps.user.enums import EmailType, SignupTypes
-from apps.user.models import User, UserResume
-from apps.user.services import ResumeParserService
+from apps.user.models import User
 from apps.user.utils import send_verification_email, create_verification_code
 
 
@@ -24,12 +20,3 @@ def post_create_handler(sender, instance, created, **kwargs):
         customer = CustomerService().create_customer(email=instance.email)
         instance.stripe_customer_id = customer.id
         instance.save()
-
-
-@receiver(post_save, sender=UserResume)
-def post_create_(sender, instance, created, **kwargs):
-    logging.getLogger('common').info('UserResume post_create_handler')
-    if created:
-        ResumeParserService(instance).save_parsed_data()
-
-
@@ -1,3 +1,71 @@
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from apps.job_applying.tests import create_subscribed_user
+from apps.user.models import User, UserResume, UserResumeParsedData
+from apps.user.services import ResumeIngestionService, ResumeParserService
+
+
+class ProfileQueriesTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = create_subscribed_user('profile@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # warms up the plan limits and marks the welcome as said
+        self.client.get('/api/v1/user/profile/retrive/')
+
+    def test_profile_query_count(self):
+        # a fresh user per request as the authentication would load, the snapshot is memoized on it
+        self.client.force_authenticate(User.objects.get(pk=self.user.pk))
+        with self.assertNumQueries(9):
+            response = self.client.get('/api/v1/user/profile/retrive/')
+        self.assertEqual(response.status_code, 200)
+
+
+class ResumeDeduplicationTestCase(TestCase):
+    content_hash = 'a' * 64
+
+    def setUp(self):
+        self.user = create_subscribed_user('resumes@example.com')
+        self.other_user = create_subscribed_user('other-resumes@example.com')
+
+    def create_resume(self, user, parsed_data=None):
+        resume = UserResume.objects.create(
+            user=user, display_name='Resume', content_hash=self.content_hash, text='Python developer'
+        )
+        if parsed_data is not None:
+            ResumeParserService(resume).store(parsed_data, parse_duration=1.5)
+        return resume
+
+    def test_duplicates_are_looked_up_among_the_users_resumes(self):
+        resume = self.create_resume(self.user)
+        service = ResumeIngestionService()
+        service.content_hash = self.content_hash
+
+        self.assertEqual(service.find_duplicate(self.user), resume)
+        self.assertIsNone(service.find_duplicate(self.other_user))
+
+    def test_parsed_data_is_shared_until_the_last_resume_is_deleted(self):
+        original = self.create_resume(self.user, {'skills': ['Python']})
+        duplicate = self.create_resume(self.user)
+
+        self.assertTrue(ResumeParserService(duplicate).use_parsed_data(original))
+        self.assertEqual(duplicate.parsed_data_id, original.parsed_data_id)
+        self.assertEqual(UserResumeParsedData.objects.count(), 1)
+
+        original.delete()
+        self.assertTrue(UserResumeParsedData.objects.filter(pk=duplicate.parsed_data_id).exists())
+        duplicate.delete()
+        self.assertFalse(UserResumeParsedData.objects.exists())
+
+    def test_parsing_a_shared_resume_again_keeps_the_shared_data(self):
+        original = self.create_resume(self.user, {'skills': ['Python']})
+        duplicate = self.create_resume(self.user)
+        ResumeParserService(duplicate).use_parsed_data(original)
+
+        ResumeParserService(duplicate).store({'skills': ['Django']})
+        original.refresh_from_db()
+        self.assertEqual(original.parsed_data.data, {'skills': ['Python']})
+        self.assertEqual(duplicate.parsed_data.data, {'skills': ['Django']})
@@ -19,5 +19,6 @@ urlpatterns = [
     path('setup-job-settings/', UserJobSettingsSetupAPIView.as_view()),
     path('setup-job-search-filters/', SetupJobSearchFiltersAPIView.as_view()),
     path('change-default-resume/<int:resume_id>/', ChangeDefaultResumeAPIView.as_view()),
+    path('resumes/upload/', UploadResumeAPIView.as_view()),
 
 ]
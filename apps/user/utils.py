@@ -1,19 +1,22 @@
 import datetime
+import functools
 import logging
 import secrets
 from typing import Union
 
 import requests
 from django.conf import settings
+from django.core.files.storage import default_storage
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework.exceptions import APIException
+from storages.backends.s3boto3 import S3Boto3Storage
 
 from apps.core.exceptions import BaseNotFoundError, BaseAPIException
 from apps.user.enums import EmailType, EMAIL_TEMPLATES
-from apps.user.models import UserEmailVerificationCode, User
+from apps.user.models import UserEmailVerificationCode, User, UserResume
 
 
 def create_verification_code(email: str) -> UserEmailVerificationCode:
@@ -111,3 +114,21 @@ def send_verification_email(user: User, code: UserEmailVerificationCode, email_t
 
 def get_user_by_stripe_customer_id(customer_id: str) -> Union[User, None]:
     return User.objects.filter(stripe_customer_id=customer_id).first()
+
+
+@functools.lru_cache(maxsize=None)
+def get_signing_storage() -> S3Boto3Storage:
+    return S3Boto3Storage(querystring_auth=True, querystring_expire=settings.AWS_PRESIGNED_URL_EXPIRE)
+
+
+def get_resume_presigned_url(resume: UserResume) -> Union[str, None]:
+    """
+        Returns a short-lived signed url which downloads the resume directly from S3,
+        or None when files aren't stored in S3 and have to be served by the app.
+    """
+    if not isinstance(default_storage, S3Boto3Storage):
+        return None
+
+    return get_signing_storage().url(resume.file.name, parameters={
+        'ResponseContentDisposition': f'attachment; filename="{resume.file.name}"'
+    })
@@ -1,7 +1,10 @@
 
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
 from rest_framework import status
 from rest_framework.generics import CreateAPIView, RetrieveDestroyAPIView, UpdateAPIView, \
     get_object_or_404
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -10,6 +13,7 @@ from rest_framework_simplejwt.views import TokenViewBase
 from apps.job_applying.decorators import active_plan_requires
 from apps.core.decorators import validate_request_params
 from apps.core.exceptions import BaseNotFoundError, BaseAPIException
+from apps.core.upload_handlers import MaxSizeUploadHandler
 from apps.payment.utils import user_subscribes_to_free_plan
 from apps.user.enums import EmailType
 from apps.user.mixins import RetrieveUserByEmailMixin
@@ -246,6 +250,33 @@ class ChangeDefaultResumeAPIView(APIView):
         return Response(status=status.HTTP_206_PARTIAL_CONTENT)
 
 
+class UploadResumeAPIView(CreateAPIView):
+    """
+        API view for uploading a resume as multipart/form-data (fields: file, display_name).
+        The file is streamed chunk by chunk to a temporary file and its size is validated while
+        streaming, the first uploaded resume becomes the default one.
+    """
+    serializer_class = UploadResumeSerializer
+    parser_classes = (MultiPartParser,)
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [
+            MaxSizeUploadHandler(request, max_size=settings.RESUME_MAX_SIZE),
+            TemporaryFileUploadHandler(request),
+        ]
+        return super().initialize_request(request, *args, **kwargs)
+
+    @active_plan_requires
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        resume = serializer.save(user=self.request.user)
+        if not self.request.user.selected_resume_id:
+            self.request.user.selected_resume = resume
+            self.request.user.save()
+
+
 class SetupJobSearchFiltersAPIView(CreateAPIView):
     """
         API view for setting up job search filters for a user's profile.
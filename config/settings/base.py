@@ -120,6 +120,23 @@ DATABASES = {
     }
 }
 
+# Cache
+# shared by all workers when REDIS_URL is set, otherwise local to the process
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 AUTH_USER_MODEL = 'user.User'
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -210,10 +227,56 @@ AWS_ACCESS_KEY_ID = os.environ.get('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = os.environ.get('AWS_SECRET_ACCESS_KEY')
 AWS_STORAGE_BUCKET_NAME = os.environ.get('AWS_STORAGE_BUCKET_NAME')
 AWS_QUERYSTRING_AUTH = False
+# lifetime in seconds of signed urls given for private files (ex. resume downloads)
+AWS_PRESIGNED_URL_EXPIRE = int(os.environ.get('AWS_PRESIGNED_URL_EXPIRE', 60))
 
 
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 
 JOB_APPLYING_INTERVAL = int(os.environ.get('JOB_APPLYING_INTERVAL', 0))
+# finished jobs older than it are moved to the archive tables by the archive_applied_jobs command
+APPLIED_JOBS_ARCHIVE_AFTER_DAYS = int(os.environ.get('APPLIED_JOBS_ARCHIVE_AFTER_DAYS', 180))
+# in seconds, created jobs older than it are canceled by the cancel_stale_jobs command
+STALE_CREATED_JOB_TTL = int(os.environ.get('STALE_CREATED_JOB_TTL', 60 * 60))
+
+# max number of jobs checked by one bulk eligibility request (one search results page is ~25)
+BULK_ELIGIBILITY_MAX_JOBS = int(os.environ.get('BULK_ELIGIBILITY_MAX_JOBS', 50))
+
+# excluded companies also match as whole words inside longer company names
+EXCLUDED_COMPANIES_SUBSTRING_MATCH = os.environ.get('EXCLUDED_COMPANIES_SUBSTRING_MATCH', 'False') == 'True'
+# in seconds, matchers are also deleted when the user saves the job search filters
+COMPANY_MATCHER_CACHE_TIMEOUT = int(os.environ.get('COMPANY_MATCHER_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# in seconds, lifetime of the per user applied job ids Bloom filter used by duplicate checks
+APPLIED_JOBS_INDEX_TIMEOUT = int(os.environ.get('APPLIED_JOBS_INDEX_TIMEOUT', 60 * 60 * 6))
+# extra job ids room of a rebuilt filter
+APPLIED_JOBS_INDEX_MIN_CAPACITY = int(os.environ.get('APPLIED_JOBS_INDEX_MIN_CAPACITY', 1000))
+# max number of jobs created since a cached filter was built that are added to it, more rebuild it
+APPLIED_JOBS_INDEX_MAX_ADDED = int(os.environ.get('APPLIED_JOBS_INDEX_MAX_ADDED', 100))
+
+# in seconds, how long responses of requests with an Idempotency-Key are replayed
+IDEMPOTENCY_KEY_TIMEOUT = int(os.environ.get('IDEMPOTENCY_KEY_TIMEOUT', 60 * 60 * 24))
+# in seconds, how long a request with an Idempotency-Key is considered running (a few times the longest request)
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+
+# search the FULLTEXT indexes on MySQL instead of LIKE, off until benchmarked against the user's own rows:
+# the index matches the rows of all users before they are filtered by user
+FULLTEXT_SEARCH_ENABLED = os.environ.get('FULLTEXT_SEARCH_ENABLED', 'False') == 'True'
+# MySQL innodb_ft_min_token_size, shorter words aren't in the FULLTEXT indexes and are searched with LIKE
+FULLTEXT_MIN_TOKEN_SIZE = int(os.environ.get('FULLTEXT_MIN_TOKEN_SIZE', 3))
+# max page size of the paginated list endpoints
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 100))
+# page size of the paginated list endpoints when ?page_size isn't given
+DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', 25))
+# the optional total count of the cursor paginated lists stops counting above it
+APPROXIMATE_COUNT_LIMIT = int(os.environ.get('APPROXIMATE_COUNT_LIMIT', 1000))
+# max number of jobs updated by one bulk status request
+BULK_STATUS_UPDATE_MAX_JOBS = int(os.environ.get('BULK_STATUS_UPDATE_MAX_JOBS', 100))
+
+# in seconds, quota status entries are also deleted on every usage or subscription change
+QUOTA_STATUS_CACHE_TIMEOUT = int(os.environ.get('QUOTA_STATUS_CACHE_TIMEOUT', 300))
+
+# in KB
+RESUME_MAX_SIZE = int(os.environ.get('RESUME_MAX_SIZE', 2000))
 
 LOGGING = LOGGING_SETTINGS